@@ -4,6 +4,8 @@ from google.cloud import bigquery
 from google.api_core.exceptions import Forbidden
 from typing import Optional, Any
 
+from .vars import ARG_DEFAULTS
+
 
 class BigQueryUtil:
     """Class to interact with Google BigQuery."""
@@ -36,7 +38,13 @@ class BigQueryUtil:
         n_rows_deleted = len([row for row in results])
         logging.info(f"Deleted {n_rows_deleted} records from table {table_id}")
 
-    def upload_data_to_table(self, table_id: str, rows: list[dict], delete_existing_data: bool = False) -> None:
+    def upload_data_to_table(
+            self,
+            table_id: str,
+            rows: list[dict],
+            delete_existing_data: bool = False,
+            batch_size: int = ARG_DEFAULTS["batch_size"]  # type: ignore[assignment]
+    ) -> None:
         """
         Upload data directly from the provided list of dictionaries to a BigQuery table.
 
@@ -47,6 +55,7 @@ class BigQueryUtil:
         row of data.
         - delete_existing_data (`bool`): If `True`, deletes existing data in the table before
          uploading. Default is `False`.
+        - batch_size (`int`): The number of rows to send per streaming insert request. Default is `500`.
         """
         if delete_existing_data:
             self._delete_existing_records(table_id)
@@ -56,8 +65,10 @@ class BigQueryUtil:
         previous_rows = destination_table.num_rows
         logging.info(f"Currently {previous_rows} rows in {table_id} before upload")
 
-        # Insert rows from the list of dictionaries
-        errors = self.client.insert_rows_json(table_id, rows)
+        # Insert rows from the list of dictionaries in batches to stay within streaming insert request limits
+        errors: list[dict] = []
+        for i in range(0, len(rows), batch_size):
+            errors.extend(self.client.insert_rows_json(table_id, rows[i:i + batch_size]))
 
         if errors:
             logging.error(f"Encountered errors while inserting rows: {errors}")
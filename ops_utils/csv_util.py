@@ -35,21 +35,9 @@ class Csv:
         **Returns:**
         - str: The path to the created TSV file.
         """
-        # Create one flat unique list by doing list comprehension where it loops
-        # through twice to make it flat and transform to set and back to list
-        # to make it unique
+        # Create one sorted unique list of the keys in all of the dicts
         if not header_list:
-            header_list = sorted(
-                list(
-                    set(
-                        [
-                            header_list
-                            for d in list_of_dicts
-                            for header_list in d.keys()
-                        ]
-                    )
-                )
-            )
+            header_list = sorted(set().union(*(d.keys() for d in list_of_dicts)))
         if self.verbose:
             logging.info(f'Creating {self.file_path}')
         with open(self.file_path, 'w', newline='') as f:
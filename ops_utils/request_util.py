@@ -2,6 +2,7 @@
 from typing import Any, Optional
 import requests
 import backoff
+from requests.adapters import HTTPAdapter
 
 from .token_util import Token
 from .vars import ARG_DEFAULTS, APPLICATION_JSON
@@ -26,6 +27,7 @@ class RunRequest:
             token: Token,
             max_retries: int = ARG_DEFAULTS["max_retries"],  # type: ignore[assignment]
             max_backoff_time: int = ARG_DEFAULTS["max_backoff_time"],  # type: ignore[assignment]
+            connection_pool_size: int = ARG_DEFAULTS["connection_pool_size"],  # type: ignore[assignment]
     ):
         """
         Initialize the RunRequest class.
@@ -34,6 +36,8 @@ class RunRequest:
         - token (`ops_utils.token_util.Token`): The token used for authentication
         - max_retries (int, optional): Maximum number of retries for a request. Defaults to `5`.
         - max_backoff_time (int, optional): Maximum backoff time for a request (in seconds). Defaults to `300`.
+        - connection_pool_size (int, optional): Maximum number of connections kept open per host. Should be at
+            least the number of threads sharing this instance. Defaults to `32`.
         """
         self.token = token
         """@private"""
@@ -41,6 +45,26 @@ class RunRequest:
         """@private"""
         self.max_backoff_time = max_backoff_time
         """@private"""
+        self.session = self._create_session(connection_pool_size)
+        """@private"""
+
+    @staticmethod
+    def _create_session(connection_pool_size: int) -> requests.Session:
+        """
+        Create a session that keeps connections alive and reuses them across requests.
+
+        Args:
+            connection_pool_size (int): The maximum number of connections to keep open per host.
+
+        Returns:
+            requests.Session: The configured session.
+        """
+        session = requests.Session()
+        # Retries are handled by backoff in run_request, so the adapter itself should not retry
+        adapter = HTTPAdapter(pool_connections=connection_pool_size, pool_maxsize=connection_pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     @staticmethod
     def _create_backoff_decorator(max_tries: int, factor: int, max_time: int) -> Any:
@@ -103,37 +127,37 @@ class RunRequest:
         def _make_request() -> requests.Response:
             headers = self.create_headers(content_type=content_type, accept=accept)
             if method == GET:
-                response = requests.get(
+                response = self.session.get(
                     uri,
                     headers=headers,
                     params=params
                 )
             elif method == POST:
                 if files:
-                    response = requests.post(
+                    response = self.session.post(
                         uri,
                         headers=headers,
                         files=files
                     )
                 else:
-                    response = requests.post(
+                    response = self.session.post(
                         uri,
                         headers=headers,
                         data=data
                     )
             elif method == DELETE:
-                response = requests.delete(
+                response = self.session.delete(
                     uri,
                     headers=headers
                 )
             elif method == PATCH:
-                response = requests.patch(
+                response = self.session.patch(
                     uri,
                     headers=headers,
                     data=data
                 )
             elif method == PUT:
-                response = requests.put(
+                response = self.session.put(
                     uri,
                     headers=headers,
                     data=data
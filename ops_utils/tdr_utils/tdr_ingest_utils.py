@@ -98,7 +98,7 @@ class BatchIngest:
         If there is mix of these types of values, it converts the non-array to a one-item list. The updated metadata
         is then returned to be used for everything downstream
         """
-        unique_headers = sorted({key for item in ingest_metadata for key in item.keys()})
+        unique_headers = sorted(set().union(*(item.keys() for item in ingest_metadata)))
 
         headers_containing_mismatch = []
         for header in unique_headers:
@@ -1,18 +1,21 @@
 """Utility classes for TDR schema."""
 
 import logging
-import re
 import time
 import numpy as np
 import pandas as pd
 import math
 from datetime import date, datetime
-from typing import Any, Optional, Union
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Optional
 
 
 class InferTDRSchema:
     """A class to infer the schema for a table in TDR (Terra Data Repository) based on input metadata."""
 
+    _FILEREF_PREFIX = "gs://"
+
     PYTHON_TDR_DATA_TYPE_MAPPING = {
         str: "string",
         "fileref": "fileref",
@@ -76,22 +79,24 @@ class InferTDRSchema:
         disparate_header_info = []
 
         for header, values_for_header in key_value_type_mappings.items():
+            non_none_values = [v for v in values_for_header if v is not None]
+            # Compare the distinct types in the column rather than every value, so each type is only checked once
+            value_types = set(map(type, non_none_values))
+            list_types = {t for t in value_types if issubclass(t, list)}
             # check if some values are lists while others are not (consider this a "mismatch" if so) while ignoring
             # "None" entries
-            if (any(isinstance(item, list) for item in values_for_header if item is not None) and
-                    not all(isinstance(item, list) for item in values_for_header if item is not None)):
+            if list_types and list_types != value_types:
                 all_values_matching = False
             # if the row contains ONLY lists of items, check that all items in each list are of the same type (while
             # ignoring "None" entries)
-            elif all(isinstance(item, list) for item in values_for_header if item is not None):
+            elif list_types == value_types:
                 # first get all substrings that have some values
-                non_empty_substrings = [v for v in values_for_header if v]
+                non_empty_substrings = [v for v in non_none_values if v]
                 if non_empty_substrings:
                     # get one "type" from the list of values
-                    first_match_type = type([v[0] for v in non_empty_substrings][0])
-                    all_values_matching = all(
-                        all(isinstance(item, first_match_type) for item in sublist) for sublist in non_empty_substrings
-                    )
+                    first_match_type = type(non_empty_substrings[0][0])
+                    item_types = set(map(type, chain.from_iterable(non_empty_substrings)))
+                    all_values_matching = all(issubclass(t, first_match_type) for t in item_types)
                 else:
                     # if all "sub-lists" are empty, assume that all types are matching (all empty lists are handled
                     # below)
@@ -99,11 +104,9 @@ class InferTDRSchema:
             else:
                 # find one value that's non-none to get the type to check against
                 # specifically check if not "None" since we can have all zeroes, for example
-                type_to_match_against = type([v for v in values_for_header if v is not None][0])
+                type_to_match_against = type(non_none_values[0])
                 # check if all the values in the list that are non-none match the type of the first entry
-                all_values_matching = all(
-                    isinstance(v, type_to_match_against) for v in values_for_header if v is not None
-                )
+                all_values_matching = all(issubclass(t, type_to_match_against) for t in value_types)
 
             # If ALL rows for the header are none, force the type to be a string
             if all_values_matching and not any(values_for_header):
@@ -151,76 +154,89 @@ class InferTDRSchema:
 
         return disparate_header_info
 
-    @staticmethod
-    def _interpret_number(x: Union[float, int]) -> Union[int, float]:
-        if isinstance(x, float) and x.is_integer():
-            return int(x)
-        return x
-
-    def _determine_if_float_or_int(self, interpreted_numbers: list[Union[int, float]]) -> str:
-        # Remove NaNs before type checks
-        non_nan_numbers = [x for x in interpreted_numbers if not (isinstance(x, float) and math.isnan(x))]
-
-        # If all values are int, return int type
-        if all(isinstance(row_value, int) for row_value in non_nan_numbers):
-            return self.PYTHON_TDR_DATA_TYPE_MAPPING[int]
-        # If ANY or ALL values are float, return float type
-        return self.PYTHON_TDR_DATA_TYPE_MAPPING[float]
-
     def _python_type_to_tdr_type_conversion(self, values_for_header: list[Any]) -> str:
         """
         Convert Python data types to TDR data types.
 
+        The values are reduced to a fingerprint of the types they contain in a single pass, and the TDR data type
+        is then looked up from the fingerprint, so columns with the same shape are only classified once.
+
         Args:
             values_for_header (Any): All values for a column header.
 
         Returns:
             str: The TDR data type.
         """
-        gcp_fileref_regex = "^gs://.*"
-
         # Collect all the non-None values for the column
         non_none_values = [v for v in values_for_header if v is not None]
 
-        # HANDLE SPECIAL CASES
+        value_types = set(map(type, non_none_values))
+        list_values = [v for v in non_none_values if isinstance(v, list)]
+        # Flatten the items in values that are lists once, so they are checked in the same pass as the other values
+        list_items = list(chain.from_iterable(list_values))
+        item_types = set(map(type, list_items))
+        # Whether any float, or any float in a list, is not a whole number (NaNs are ignored)
+        has_fraction = False
+        for item in chain((v for v in non_none_values if not isinstance(v, list)), list_items):
+            # FILE REFS AND LISTS OF FILE REFS
+            # If ANY of the values (or items in a list) for a header are of type "fileref", we assume that the
+            # column is a fileref
+            if isinstance(item, str):
+                if item.startswith(self._FILEREF_PREFIX):
+                    return self.PYTHON_TDR_DATA_TYPE_MAPPING["fileref"]
+            # Once one float with a fractional part is found, the rest of the numbers do not need checking
+            elif not has_fraction and isinstance(item, float) and not (item.is_integer() or math.isnan(item)):
+                has_fraction = True
+
+        # The type of the first non-null value (or of the first item in it if it is a list) is used when the column
+        # is not numeric. None if the first value is an empty list
+        first_type: Optional[type] = None
+        if non_none_values:
+            first_value = non_none_values[0]
+            if not isinstance(first_value, list):
+                first_type = type(first_value)
+            elif first_value:
+                first_type = type(first_value[0])
+
+        return self._tdr_type_from_fingerprint(
+            frozenset(value_types), frozenset(item_types), has_fraction, first_type
+        )
 
-        # FILE REFS AND LISTS OF FILE REFS
-        # If ANY of the values for a header are of type "fileref", we assume that the column is a fileref
-        for row_value in non_none_values:
-            if isinstance(row_value, str) and re.search(pattern=gcp_fileref_regex, string=row_value):
-                return self.PYTHON_TDR_DATA_TYPE_MAPPING["fileref"]
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def _tdr_type_from_fingerprint(
+            cls, value_types: frozenset, item_types: frozenset, has_fraction: bool, first_type: Optional[type]
+    ) -> str:
+        """
+        Determine the TDR data type for a column from a fingerprint of its values.
 
-            if isinstance(row_value, list):
-                # Check for a potential array of filerefs - if ANY of the items in a list are
-                # of type "fileref" we assume that the whole column is a fileref
-                for item in row_value:
-                    if isinstance(item, str) and re.search(pattern=gcp_fileref_regex, string=item):
-                        return self.PYTHON_TDR_DATA_TYPE_MAPPING["fileref"]
+        Args:
+            value_types (frozenset): The types of all non-null values in the column.
+            item_types (frozenset): The types of all items in values that are lists.
+            has_fraction (bool): Whether any float in the column is not a whole number.
+            first_type (type, optional): The type of the first non-null value, or of its first item if it is a list.
 
-        # INTEGERS/FLOATS AND LISTS OF INTEGERS AND FLOATS
-        # Case 1: All values are plain numbers (int or float) - specifically excluding bools
-        if all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in non_none_values):
-            interpreted_numbers = [self._interpret_number(row_value) for row_value in non_none_values]
-            return self._determine_if_float_or_int(interpreted_numbers)
+        Returns:
+            str: The TDR data type.
+        """
+        def is_number(python_type: type) -> bool:
+            # Specifically exclude bools, which are a subclass of int
+            return issubclass(python_type, (int, float)) and not issubclass(python_type, bool)
 
+        # INTEGERS/FLOATS AND LISTS OF INTEGERS AND FLOATS
+        # Case 1: All values are plain numbers (int or float). Floats that are whole numbers count as integers, so
+        # the column is only a float if any of them has a fractional part
         # Case 2: Values are lists of numbers (e.g., [[1, 2], [3.1], [4]])
-        if all(isinstance(row_value, list) for row_value in non_none_values):
-            if all(
-                    all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in row_value)
-                    for row_value in non_none_values
-            ):
-                # Flatten the list of lists and interpret all non-None elements
-                interpreted_numbers = [self._interpret_number(item)
-                                       for row_value in non_none_values for item in row_value if item is not None]
-
-                return self._determine_if_float_or_int(interpreted_numbers)
+        if all(is_number(t) for t in value_types) or (
+                all(issubclass(t, list) for t in value_types) and all(is_number(t) for t in item_types)
+        ):
+            return cls.PYTHON_TDR_DATA_TYPE_MAPPING[float if has_fraction else int]
 
         # If none of the above special cases apply, use the first of the non-null values to determine the
         # TDR data type
-        first_value = non_none_values[0]
-        if isinstance(first_value, list):
-            return self.PYTHON_TDR_DATA_TYPE_MAPPING[type(first_value[0])]
-        return self.PYTHON_TDR_DATA_TYPE_MAPPING[type(first_value)]
+        if first_type is None:
+            raise IndexError(f"Cannot determine TDR data type from an empty list, column types: {set(value_types)}")
+        return cls.PYTHON_TDR_DATA_TYPE_MAPPING[first_type]
 
     def _format_column_metadata(self, key_value_type_mappings: dict, disparate_header_info: list[dict]) -> list[dict]:
         """
@@ -235,8 +251,14 @@ class InferTDRSchema:
         """
         columns = []
 
+        # Look up whether to force each header to string by name. A header can have more than one entry, in which
+        # case the first one is used
+        force_to_string_by_header: dict[str, bool] = {}
+        for h in disparate_header_info:
+            force_to_string_by_header.setdefault(h["header"], h["force_to_string"])
+
         for header, values_for_header in key_value_type_mappings.items():
-            force_to_string = [h["force_to_string"] for h in disparate_header_info if h["header"] == header][0]
+            force_to_string = force_to_string_by_header[header]
 
             # if the ANY of the values for a given header is a list, we assume that column contains arrays of values
             array_of = True if any(isinstance(v, list) for v in values_for_header) else False
@@ -291,29 +313,6 @@ class InferTDRSchema:
 
         return header_requirements
 
-    @staticmethod
-    def _reformat_metadata(cleaned_metadata: list[dict]) -> dict:
-        """
-        Create a dictionary where the key is the header name, and the value is a list of all values for that header.
-
-        Args:
-            cleaned_metadata (list[dict]): The cleaned metadata.
-
-        Returns:
-            dict: A dictionary with header names as keys and lists of values as values.
-        """
-        key_value_type_mappings = {}
-        unique_headers = {key for row in cleaned_metadata for key in row}
-
-        for header in unique_headers:
-            for row in cleaned_metadata:
-                value = row[header]
-                if header not in key_value_type_mappings:
-                    key_value_type_mappings[header] = [value]
-                else:
-                    key_value_type_mappings[header].append(value)
-        return key_value_type_mappings
-
     def infer_schema(self) -> dict:
         """
         Infer the schema for the table based on the input metadata.
@@ -338,8 +337,9 @@ class InferTDRSchema:
         # we keep the rows where some values are none because if we happen to have a different column that's none in
         # every row, we could end up with no data at the end
         all_none_columns_dropped_df = metadata_df.dropna(axis=1, how="all")
-        cleaned_metadata = all_none_columns_dropped_df.to_dict(orient="records")
-        key_value_type_mappings = self._reformat_metadata(cleaned_metadata)
+        # Pull the values out column by column (header -> list of all values for the header), since every check
+        # below works on one column at a time
+        key_value_type_mappings = all_none_columns_dropped_df.to_dict(orient="list")
 
         # check to see if all values corresponding to a header are of the same type
         disparate_header_info = self._check_type_consistency(key_value_type_mappings)
@@ -349,10 +349,11 @@ class InferTDRSchema:
         )
 
         # combine the information about required headers with the data types that were collected
+        columns_by_name = {d["name"]: d for d in columns}
         for header_metadata in column_metadata:
-            matching_metadata = [d for d in columns if d["name"] == header_metadata["name"]]
+            matching_metadata = columns_by_name.get(header_metadata["name"])
             if matching_metadata:
-                header_metadata.update(matching_metadata[0])
+                header_metadata.update(matching_metadata)
 
         tdr_tables_json = {
             "name": self.table_name,
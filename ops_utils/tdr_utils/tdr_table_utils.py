@@ -143,6 +143,8 @@ class SetUpTDRTables:
                     update_note=f"Creating tables in dataset {self.dataset_id}",
                     tables_to_add=tables_to_create
                 )
+                # Get the schema again so the new tables are included in what is returned
+                dataset_info = self.tdr.get_dataset_info(dataset_id=self.dataset_id, info_to_include=["SCHEMA"]).json()
             else:
                 logging.info("All tables in dataset exist and are up to date")
         else:
@@ -154,8 +156,8 @@ class SetUpTDRTables:
                     "Tables need manual updating. If want to force through use ignore_existing_schema_mismatch."
                 )
                 sys.exit(1)
-        # Return schema info for all existing tables after creation
-        dataset_info = self.tdr.get_dataset_info(dataset_id=self.dataset_id, info_to_include=["SCHEMA"]).json()
+        # Return schema info for all existing tables after creation. The schema is only fetched again above if
+        # tables were created, otherwise it has not changed since the start of the run.
         # Return dict with key being table name and value being dict of columns with key being
         # column name and value being column info
         return {
@@ -253,6 +253,8 @@ class TerraWorkspace:
         """@private"""
         self.request_util = request_util
         """@private"""
+        self._gcp_util_by_project: dict[str, GCPCloudFunctions] = {}
+        self._active_gcloud_account: Optional[str] = None
         if env.lower() == "dev":
             self.terra_link = TERRA_DEV_LINK
             """@private"""
@@ -870,6 +872,34 @@ class TerraWorkspace:
             )
         return response
 
+    def _get_gcp_util(self, project: str) -> GCPCloudFunctions:
+        """
+        Get a GCPCloudFunctions instance for the given project, reusing one if it was already created.
+
+        Args:
+            project (str): The Google project ID.
+
+        Returns:
+            GCPCloudFunctions: The GCP utility for the project.
+        """
+        if project not in self._gcp_util_by_project:
+            self._gcp_util_by_project[project] = GCPCloudFunctions(project=project)
+        return self._gcp_util_by_project[project]
+
+    def _get_active_gcloud_account(self, gcp_util: GCPCloudFunctions) -> str:
+        """
+        Get the active gcloud account, only shelling out to gcloud the first time it is successfully looked up.
+
+        Args:
+            gcp_util (GCPCloudFunctions): The GCP utility used to look up the account.
+
+        Returns:
+            str: The active gcloud account email.
+        """
+        if self._active_gcloud_account is None:
+            self._active_gcloud_account = gcp_util.get_active_gcloud_account()
+        return self._active_gcloud_account
+
     def save_entity_table_version(self, entity_type: str, version_name: str) -> None:
         """Save an entity table version in a Terra workspace.
 
@@ -885,7 +915,7 @@ class TerraWorkspace:
             json.dump(workspace_metrics, json_file)
 
         # Create a zip file with the same naming convention that Terra backend uses
-        timestamp_ms = int(time.time() * 1000)
+        timestamp_ms = time.time_ns() // 1_000_000
         zip_file_name = f"{entity_type}.v{timestamp_ms}.zip"
         with zipfile.ZipFile(zip_file_name, "w", zipfile.ZIP_DEFLATED) as zipf:
             zipf.write(file_name, arcname=f"json/{file_name}")
@@ -895,10 +925,10 @@ class TerraWorkspace:
         path_to_upload_to = os.path.join(
             "gs://", workspace_info["workspace"]["bucketName"], ".data-table-versions", entity_type, zip_file_name
         )
-        gcp_util = GCPCloudFunctions(project=workspace_info["workspace"]["googleProject"])
+        gcp_util = self._get_gcp_util(project=workspace_info["workspace"]["googleProject"])
         # Attempt to get the currently active gcloud account. Default to the workspace creator if that fails
         try:
-            active_account = gcp_util.get_active_gcloud_account()
+            active_account = self._get_active_gcloud_account(gcp_util)
         except Exception as e:
             active_account = workspace_info["workspace"]["createdBy"]
             logging.error(
@@ -1115,6 +1145,10 @@ class TerraWorkspace:
             # Only look at individual submissions if retrieve running ids set to true
             # and only look at submissions that are still running
             if retrieve_running_ids and submission['status'] not in ["Done", "Aborted"]:
+                # Skip the detailed lookup if the summary already shows no running/pending workflows
+                active_count = sum(wf_status.get(status, 0) for status in ["Running", "Submitted", "Queued"])
+                if active_count == 0:
+                    continue
                 submission_detailed = self.get_submission_status(submission_id=submission["submissionId"]).json()
                 for workflow in submission_detailed["workflows"]:
                     if workflow["status"] in ["Running", "Submitted", "Queued"]:
@@ -0,0 +1,66 @@
+"""Recorded TDR dataset, snapshot and table shared by the test_tdr_api_utils*.py modules."""
+import json
+
+TEST_DATASET_ID = "eccc736d-2a5a-4d54-a72e-dcdb9f10e67f"
+BILLING_PROFILE = "ce149ca7-608b-4d5d-9612-2a43a7378885"
+DATASET_NAME = "ops_test_tdr_dataset"
+SNAPSHOT_ID = "fc9fb496-41ff-4c9d-a825-514b86100e14"
+TABLE_NAME = "test_table"
+
+TEST_INGEST_METRICS = [
+    {
+        "sample_id": "sample1",
+        "file_1": {
+            "sourcePath": "gs://fc-90271ac6-9449-462c-ae97-71d6fad6b669/test.txt",
+            "targetPath": "/test.txt",
+        }
+    },
+    {
+        "sample_id": "sample2",
+        "file_1": {
+            "sourcePath": "gs://fc-90271ac6-9449-462c-ae97-71d6fad6b669/test.csv",
+            "targetPath": "/test.csv",
+        }
+    },
+    {
+        "sample_id": "sample3",
+        "file_1": {
+            "sourcePath": "gs://fc-90271ac6-9449-462c-ae97-71d6fad6b669/test.tsv",
+            "targetPath": "/test.tsv",
+        }
+    },
+]
+
+# Schema the recorded dataset was created with
+TEST_DATASET_SCHEMA = {
+    "tables": [
+        {
+            "name": "ingestion_reference",
+            "columns": [
+                {
+                    "name": "key", "datatype": "string",
+                    "array_of": False,
+                    "required": True
+                },
+                {
+                    "name": "value",
+                    "datatype": "string",
+                    "array_of": False,
+                    "required": True
+                }
+            ],
+            "primaryKey": ["key"]
+        }
+    ]
+}
+
+# Serialized ingest request for TEST_INGEST_METRICS
+TEST_INGEST_REQUEST_JSON = json.dumps({
+    "format": "array",
+    "records": TEST_INGEST_METRICS,
+    "table": TABLE_NAME,
+    "resolve_existing_files": "true",
+    "updateStrategy": "REPLACE",
+    "load_tag": "test_tag",
+    "bulkMode": "false"
+})
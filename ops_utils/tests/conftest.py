@@ -0,0 +1,56 @@
+import os
+
+import pytest
+import responses
+
+from helpers import LOAD_FILE_PATCH, MOCK_CREDENTIALS, StubToken
+from ops_utils.request_util import RunRequest
+from ops_utils.tdr_utils.tdr_api_utils import TDR
+
+
+def pytest_configure(config):
+    # Point default credential discovery at a fake key file, which LOAD_FILE_PATCH then intercepts.
+    # Set once here (in every xdist worker too) rather than by each test module at import time.
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "test_creds.json"
+
+
+@pytest.fixture(scope="module")
+def mock_gcp_credentials():
+    """Resolve default Google credentials to MOCK_CREDENTIALS for the rest of the module.
+
+    Module scoped so the patch is undone before the next module, which may patch the same target itself.
+    """
+    with LOAD_FILE_PATCH:
+        yield MOCK_CREDENTIALS
+
+
+@pytest.fixture(scope="session")
+def request_util():
+    """One RunRequest for the whole session, authenticated with a stub token."""
+    return RunRequest(token=StubToken())
+
+
+@pytest.fixture(scope="session")
+def tdr_util(request_util):
+    """One TDR client for the whole session.
+
+    `responses` intercepts its requests at the transport adapter, so the client holds no per-test state.
+    """
+    return TDR(request_util=request_util)
+
+
+@pytest.fixture(scope="module")
+def _module_responses():
+    """Intercept requests made through the requests transport adapter for the rest of the module."""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as requests_mock:
+        yield requests_mock
+
+
+@pytest.fixture
+def mocked_responses(_module_responses):
+    """Mock for registering the responses a test expects.
+
+    The mock is only started once per module. Registrations and recorded calls are cleared after each test.
+    """
+    yield _module_responses
+    _module_responses.reset()
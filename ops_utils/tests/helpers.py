@@ -0,0 +1,89 @@
+"""Stand-ins and recorded response helpers shared by the test modules."""
+import glob
+import os
+from functools import lru_cache
+from unittest.mock import patch
+
+import responses
+import yaml
+from google.auth import credentials
+
+
+class StubCredentials(credentials.CredentialsWithQuotaProject):
+    """Always-valid credentials that never reach out to a token endpoint.
+
+    Subclasses the real base class, since Google API clients reject credentials that are not
+    `google.auth.credentials.Credentials` instances.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.token = "fake-token"
+
+    def refresh(self, request):
+        pass
+
+    def with_quota_project(self, quota_project_id):
+        return self
+
+
+MOCK_CREDENTIALS = StubCredentials()
+
+
+class StubToken:
+    """Stand-in for `ops_utils.token_util.Token` with only what RunRequest reads."""
+
+    token_string = "fake-token"
+
+    def get_token(self):
+        return self.token_string
+
+
+# Use the LibYAML-backed loader when PyYAML was built with it, it parses the recorded responses much faster
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Resolves default credentials to MOCK_CREDENTIALS when building Google API clients
+LOAD_FILE_PATCH = patch(
+    "google.auth._default.load_credentials_from_file",
+    return_value=(MOCK_CREDENTIALS, 'operations-portal-427515'),
+    autospec=True,
+)
+
+
+@lru_cache(maxsize=None)
+def _load_responses_file(file_path: str) -> tuple:
+    """Parse a recorded responses YAML file once and cache the Response arguments for each entry.
+
+    Only the arguments are cached. A Response records the calls it matches, so each registration
+    builds fresh ones and calls made in earlier tests are never counted against later ones.
+    """
+    with open(file_path) as f:
+        data = yaml.load(f, Loader=YAML_LOADER)
+    return tuple(
+        {
+            "method": rsp["method"],
+            "url": rsp["url"],
+            "body": rsp["body"],
+            "status": rsp["status"],
+            "headers": rsp["headers"],
+            "content_type": rsp["content_type"],
+            "auto_calculate_content_length": rsp["auto_calculate_content_length"],
+        }
+        for rsp in (entry["response"] for entry in data["responses"])
+    )
+
+
+def preload_responses_files(directory: str) -> None:
+    """Parse and cache every recorded responses YAML file in directory up front."""
+    for file_path in sorted(glob.glob(os.path.join(directory, "*.yaml"))):
+        _load_responses_file(file_path)
+
+
+def add_responses_from_file(file_path: str, requests_mock=responses) -> None:
+    """Register every response recorded in file_path, reusing the parsed YAML across tests.
+
+    Drop-in replacement for `responses._add_from_file(file_path=...)`. Responses are registered on
+    requests_mock, which defaults to the mock activated by `@responses.activate`.
+    """
+    for response_kwargs in _load_responses_file(file_path):
+        requests_mock.add(responses.Response(**response_kwargs))
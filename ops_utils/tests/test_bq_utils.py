@@ -1,17 +1,58 @@
 import pytest
 import unittest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from google.api_core.exceptions import Forbidden
 
 from ops_utils.bq_utils import BigQueryUtil
 
 
+class FakeQueryJob:
+    """Stand-in for a BigQuery query job that returns fixed rows or raises a fixed error."""
+
+    def __init__(self, rows=None, error=None):
+        self.rows = rows if rows is not None else []
+        self.error = error
+        self.result_call_count = 0
+
+    def result(self):
+        self.result_call_count += 1
+        if self.error:
+            raise self.error
+        return self.rows
+
+
+class FakeBigQueryClient:
+    """Stand-in for bigquery.Client that records the calls made to it."""
+
+    def __init__(self):
+        self.calls = []
+        self.num_rows = 0
+        self.insert_errors = []
+        self.query_job = FakeQueryJob()
+
+    def calls_to(self, method_name):
+        return [args for name, args in self.calls if name == method_name]
+
+    def get_table(self, table_id):
+        self.calls.append(("get_table", (table_id,)))
+        return SimpleNamespace(num_rows=self.num_rows)
+
+    def insert_rows_json(self, table_id, rows):
+        self.calls.append(("insert_rows_json", (table_id, rows)))
+        return self.insert_errors
+
+    def query(self, query):
+        self.calls.append(("query", (query,)))
+        return self.query_job
+
+
 class TestBigQueryUtils(unittest.TestCase):
 
     @patch("ops_utils.bq_utils.bigquery.Client")
     def setUp(self, mock_bigquery_client):
-        self.mock_client_instance = MagicMock()
-        mock_bigquery_client.return_value = self.mock_client_instance
+        self.fake_client = FakeBigQueryClient()
+        mock_bigquery_client.return_value = self.fake_client
 
         self.project_id = "fake_project_id"
         self.table_id = "fake_table_id"
@@ -21,55 +62,49 @@ class TestBigQueryUtils(unittest.TestCase):
         self.sample_data = [{"col1": "val1", "col2": "val2"}, {"col1": "val3", "col2": "val4"}]
 
     def test_upload_data_to_table(self):
-        mock_table = MagicMock()
-        mock_table.num_rows = 0
-        self.mock_client_instance.get_table.return_value = mock_table
-
-        # Mock insert_rows_json to return no errors
-        self.mock_client_instance.insert_rows_json.return_value = []
-
         # Run the method
         self.bq_util.upload_data_to_table(table_id=self.table_id, rows=self.sample_data)
 
         # Assertions
-        self.mock_client_instance.get_table.assert_called_with(self.table_id)
-        self.mock_client_instance.insert_rows_json.assert_called_once_with(self.table_id, self.sample_data)
-        self.assertEqual(self.mock_client_instance.get_table.call_count, 2)  # Once before insert, once after
+        # Once before insert, once after
+        self.assertEqual(self.fake_client.calls_to("get_table"), [(self.table_id,), (self.table_id,)])
+        self.assertEqual(self.fake_client.calls_to("insert_rows_json"), [(self.table_id, self.sample_data)])
+
+    def test_upload_data_to_table_in_batches(self):
+        rows = [{"col1": f"val{i}"} for i in range(5)]
+
+        # Run the method
+        self.bq_util.upload_data_to_table(table_id=self.table_id, rows=rows, batch_size=2)
+
+        # Assert that the rows were inserted in order, in batches of at most 2
+        self.assertEqual(
+            self.fake_client.calls_to("insert_rows_json"),
+            [(self.table_id, rows[0:2]), (self.table_id, rows[2:4]), (self.table_id, rows[4:5])]
+        )
 
     @patch("ops_utils.bq_utils.BigQueryUtil._delete_existing_records")
     def test_upload_data_to_table_delete_existing_data(self, mock_delete_existing_records):
-        mock_table = MagicMock()
-        mock_table.num_rows = 0
-        self.mock_client_instance.get_table.return_value = mock_table
-
         mock_delete_existing_records.return_value = None
 
-        # Mock insert_rows_json to return no errors
-        self.mock_client_instance.insert_rows_json.return_value = []
-
         # Run the method
         self.bq_util.upload_data_to_table(table_id=self.table_id, rows=self.sample_data, delete_existing_data=True)
 
         # Assertions
-        self.mock_client_instance.get_table.assert_called_with(self.table_id)
-        self.mock_client_instance.insert_rows_json.assert_called_once_with(self.table_id, self.sample_data)
+        self.assertEqual(self.fake_client.calls_to("get_table"), [(self.table_id,), (self.table_id,)])
+        self.assertEqual(self.fake_client.calls_to("insert_rows_json"), [(self.table_id, self.sample_data)])
         mock_delete_existing_records.assert_called_once_with(self.table_id)
-        self.assertEqual(self.mock_client_instance.get_table.call_count, 2)  # Once before insert, once after
 
     def test_query_table(self):
-        # Mock the BQ client "query" call
-        mock_query_job = MagicMock()
-        mock_query_job.result.return_value = self.fake_query_result
-
-        self.mock_client_instance.query.return_value = mock_query_job
+        # Have the BQ client "query" call return the fake results
+        self.fake_client.query_job = FakeQueryJob(rows=self.fake_query_result)
 
         # Run the method
         result = self.bq_util.query_table(query=self.query)
 
         # Assert that the BQ client runs query with the defined select statement
-        self.mock_client_instance.query.assert_called_once_with(self.query)
+        self.assertEqual(self.fake_client.calls_to("query"), [(self.query,)])
         # Assert that BQ client calls the "result" method
-        mock_query_job.result.assert_called_once()
+        self.assertEqual(self.fake_client.query_job.result_call_count, 1)
         # Asserts that the expected result is returned
         self.assertEqual(result, self.fake_query_result)
 
@@ -98,7 +133,7 @@ class TestBigQueryUtils(unittest.TestCase):
         self.assertFalse(res)
 
     def test__check_permissions_valid_permissions(self):
-        self.mock_client_instance.query.result.return_value = self.fake_query_result
+        self.fake_client.query_job = FakeQueryJob(rows=self.fake_query_result)
 
         # Run the method
         res = self.bq_util._check_permissions(qry=self.query)
@@ -107,7 +142,7 @@ class TestBigQueryUtils(unittest.TestCase):
 
     def test__check_permissions_invalid_permissions(self):
         # Simulate Forbidden error when .result() is called
-        self.mock_client_instance.query.return_value.result.side_effect = Forbidden("403 Permission Denied")
+        self.fake_client.query_job = FakeQueryJob(error=Forbidden("403 Permission Denied"))
 
         # Run the method
         res = self.bq_util._check_permissions(qry=self.query)
@@ -117,7 +152,7 @@ class TestBigQueryUtils(unittest.TestCase):
 
     def test__check_permissions_invalid_permissions_raise_on_other_failure(self):
         # Simulate Exception error when .result() is called
-        self.mock_client_instance.query.return_value.result.side_effect = Exception("Some fake error")
+        self.fake_client.query_job = FakeQueryJob(error=Exception("Some fake error"))
 
         # Assert that the exception is raised when "raise_on_other_failure" is set to True
         with pytest.raises(Exception, match="Some fake error"):
@@ -125,7 +160,7 @@ class TestBigQueryUtils(unittest.TestCase):
 
     def test__check_permissions_invalid_permissions_not_raise_on_other_failure(self):
         # Simulate Exception error when .result() is called
-        self.mock_client_instance.query.return_value.result.side_effect = Exception("Some fake error")
+        self.fake_client.query_job = FakeQueryJob(error=Exception("Some fake error"))
 
         res = self.bq_util._check_permissions(qry=self.query, raise_on_other_failure=False)
         # Assert that "False" is returned when an exception is encountered by "raise_on_other_failure" is set to False
@@ -138,4 +173,4 @@ class TestBigQueryUtils(unittest.TestCase):
         # Create the "delete" query using the fake table ID
         fake_delete_query = f"DELETE FROM `{self.table_id}` WHERE TRUE"
         # Asert that the query was run with the expected select statement
-        self.mock_client_instance.query.assert_called_with(fake_delete_query)
+        self.assertEqual(self.fake_client.calls_to("query")[-1], (fake_delete_query,))
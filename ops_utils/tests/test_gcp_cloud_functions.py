@@ -14,6 +14,8 @@ class TestGCPCloudFunctionCaller(unittest.TestCase):
         mock_default.return_value = (MagicMock(), "test-project")
         self.mock_service = MagicMock()
         mock_build.return_value = self.mock_service
+        # Hold on to the leaf "call" mock so tests don't walk the projects().locations().functions() chain
+        self.mock_call = self.mock_service.projects.return_value.locations.return_value.functions.return_value.call
 
         # Initialize the GCPCloudFunctionCaller with mocked dependencies
         self.cloud_function_caller = GCPCloudFunctionCaller()
@@ -23,7 +25,7 @@ class TestGCPCloudFunctionCaller(unittest.TestCase):
         # Mock the response from the API
         mock_request = MagicMock()
         mock_request.execute.return_value = {"result": "success"}
-        self.mock_service.projects().locations().functions().call.return_value = mock_request
+        self.mock_call.return_value = mock_request
 
         # Call the method
         response = self.cloud_function_caller.call_function(
@@ -33,7 +35,7 @@ class TestGCPCloudFunctionCaller(unittest.TestCase):
 
         # Assertions
         self.assertEqual(response, {"result": "success"})
-        self.mock_service.projects().locations().functions().call.assert_called_once_with(
+        self.mock_call.assert_called_once_with(
             name="projects/test-project/locations/us-central1/functions/test-function",
             body={"data": '{"key": "value"}'}
         )
@@ -41,7 +43,7 @@ class TestGCPCloudFunctionCaller(unittest.TestCase):
     def test_call_function_failure(self):
         """Test call_function with an exception."""
         # Mock the API to raise an exception
-        self.mock_service.projects().locations().functions().call.side_effect = Exception("API error")
+        self.mock_call.side_effect = Exception("API error")
 
         # Call the method and assert it raises an exception
         with self.assertRaises(Exception) as context:
@@ -51,7 +53,7 @@ class TestGCPCloudFunctionCaller(unittest.TestCase):
             )
 
         self.assertIn("API error", str(context.exception))
-        self.mock_service.projects().locations().functions().call.assert_called_once_with(
+        self.mock_call.assert_called_once_with(
             name="projects/test-project/locations/us-central1/functions/test-function",
             body={"data": '{"key": "value"}'}
         )
\ No newline at end of file
@@ -1,121 +1,98 @@
-import os
-import responses
-from unittest.mock import MagicMock, mock_open, patch
-from google.auth import credentials
+import pytest
 
+from helpers import add_responses_from_file, preload_responses_files
 from ops_utils.gcp_utils import GCPCloudFunctions
 
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "test_creds.json"
 
-MOCK_CREDENTIALS = MagicMock(spec=credentials.CredentialsWithQuotaProject)
-MOCK_CREDENTIALS.with_quota_project.return_value = MOCK_CREDENTIALS
-MOCK_CREDENTIALS.universe_domain = "googleapis.com"
+@pytest.fixture(scope="module")
+def gcp_client(mock_gcp_credentials):
+    """Build the client once per module so credential discovery only runs a single time."""
+    return GCPCloudFunctions()
 
-LOAD_FILE_PATCH = patch(
-    "google.auth._default.load_credentials_from_file",
-    return_value=(MOCK_CREDENTIALS, 'operations-portal-427515'),
-    autospec=True,
-)
 
-def create_gcp_client():
-    with LOAD_FILE_PATCH:
-        gcp_client = GCPCloudFunctions()
-    return gcp_client
+class TestGCPUtils:
 
+    @classmethod
+    def setup_class(cls):
+        # Parse all the recorded responses once. Each test still registers only its own file,
+        # since several files record different responses for the same URLs.
+        preload_responses_files("ops_utils/tests/data/gcp_util")
 
-class TestGCPUtils:
-    
-    gcp_client = create_gcp_client()
-    
-    @responses.activate
-    def test_load_file(self):
+    def test_load_file(self, gcp_client, mocked_responses):
         test_gcs_path = "gs://test_bucket/file001.bin"
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/load_blob.yaml")
-        test_blob = self.gcp_client.load_blob_from_full_path(test_gcs_path)
+        add_responses_from_file("ops_utils/tests/data/gcp_util/load_blob.yaml", mocked_responses)
+        test_blob = gcp_client.load_blob_from_full_path(test_gcs_path)
         assert test_blob 
 
-    @responses.activate
-    def test_check_file_exists(self):
+    def test_check_file_exists(self, gcp_client, mocked_responses):
         test_gcs_path = "gs://test_bucket/file001.bin"
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/check_file_exists.yaml")
-        test_blob = self.gcp_client.check_file_exists(test_gcs_path)
+        add_responses_from_file("ops_utils/tests/data/gcp_util/check_file_exists.yaml", mocked_responses)
+        test_blob = gcp_client.check_file_exists(test_gcs_path)
         assert test_blob
 
-    @responses.activate
-    def test_list_bucket(self):
+    def test_list_bucket(self, gcp_client, mocked_responses):
         bucket_name = "test_bucket"
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/list_bucket.yaml")
-        list_bucket = self.gcp_client.list_bucket_contents(bucket_name=bucket_name)
+        add_responses_from_file("ops_utils/tests/data/gcp_util/list_bucket.yaml", mocked_responses)
+        list_bucket = gcp_client.list_bucket_contents(bucket_name=bucket_name)
         assert len(list_bucket) == 20
 
-    @responses.activate
-    def test_copy_file(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/copy_file.yaml")
-        self.gcp_client.copy_cloud_file(src_cloud_path="gs://test_src_path/file001.bin", full_destination_path="gs://dest_bucket/file001.bin")
+    def test_copy_file(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/copy_file.yaml", mocked_responses)
+        gcp_client.copy_cloud_file(src_cloud_path="gs://test_src_path/file001.bin", full_destination_path="gs://dest_bucket/file001.bin")
 
-    @responses.activate
-    def test_delete_file(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/delete_file.yaml")
-        self.gcp_client.delete_cloud_file(full_cloud_path="gs://test_bucket/file002.bin")
+    def test_delete_file(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/delete_file.yaml", mocked_responses)
+        gcp_client.delete_cloud_file(full_cloud_path="gs://test_bucket/file002.bin")
     
-    @responses.activate
-    def test_move_file(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/move_file.yaml")
-        self.gcp_client.move_cloud_file(src_cloud_path='gs://test_bucket/file004.bin', full_destination_path='gs://test_bucket/file004_moved.bin')
-
-    @responses.activate
-    def test_get_filesize(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/get_filesize.yaml")
-        filesize = self.gcp_client.get_filesize(target_path="gs://test_bucket/file001.bin")
+    def test_move_file(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/move_file.yaml", mocked_responses)
+        gcp_client.move_cloud_file(src_cloud_path='gs://test_bucket/file004.bin', full_destination_path='gs://test_bucket/file004_moved.bin')
+
+    def test_get_filesize(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/get_filesize.yaml", mocked_responses)
+        filesize = gcp_client.get_filesize(target_path="gs://test_bucket/file001.bin")
         assert filesize == 21788
 
-    @responses.activate
-    def test_check_if_files_are_same(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/check_files_same.yaml")
-        files_identical = self.gcp_client.validate_files_are_same(src_cloud_path="gs://test_bucket/file001.bin", dest_cloud_path="gs://test_bucket/file002.bin")
+    def test_check_if_files_are_same(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/check_files_same.yaml", mocked_responses)
+        files_identical = gcp_client.validate_files_are_same(src_cloud_path="gs://test_bucket/file001.bin", dest_cloud_path="gs://test_bucket/file002.bin")
         assert not files_identical
 
-    @responses.activate
-    def test_read_file(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/read_file.yaml")
-        data = self.gcp_client.read_file(cloud_path='gs://test_bucket/uploaded_test_file.txt')
+    def test_read_file(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/read_file.yaml", mocked_responses)
+        data = gcp_client.read_file(cloud_path='gs://test_bucket/uploaded_test_file.txt')
         assert data == "test\n\ndata\n\nhere"
 
-    @responses.activate
-    def test_upload_blob(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/upload_blob.yaml")
-        with patch('google.cloud.storage.blob.open', mock_open(read_data=b"test data here")):
-            self.gcp_client.upload_blob(destination_path='gs://test_bucket/uploaded_blob.txt', source_file='source_file.txt')
+    def test_upload_blob(self, gcp_client, mocked_responses, tmp_path):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/upload_blob.yaml", mocked_responses)
+        # Upload a real file, since the upload reads its size with os.fstat on the file descriptor
+        source_file = tmp_path / "source_file.txt"
+        source_file.write_bytes(b"test data here")
+        gcp_client.upload_blob(destination_path='gs://test_bucket/uploaded_blob.txt', source_file=str(source_file))
 
-    @responses.activate
-    def test_get_md5(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/get_blob_md5.yaml")
-        md5 = self.gcp_client.get_object_md5(file_path='gs://test_bucket/uploaded_test_file.txt')
+    def test_get_md5(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/get_blob_md5.yaml", mocked_responses)
+        md5 = gcp_client.get_object_md5(file_path='gs://test_bucket/uploaded_test_file.txt')
         assert md5 == "e7c8241f3451ef053f4854f8faa1cf71"
 
-    @responses.activate
-    def test_set_acl_public(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/set_blob_acl_public.yaml")
-        self.gcp_client.set_acl_public_read(cloud_path="gs://test_bucket/dummy_file.txt")
+    def test_set_acl_public(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/set_blob_acl_public.yaml", mocked_responses)
+        gcp_client.set_acl_public_read(cloud_path="gs://test_bucket/dummy_file.txt")
     
-    @responses.activate
-    def test_acl_group_owner(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/set_acl_group_owner.yaml")
-        self.gcp_client.set_acl_group_owner(cloud_path="gs://test_bucket/uploaded_blob.txt", group_email='test_group@firecloud.org')
-
-    @responses.activate
-    def test_metadata_cache_control(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/set_metadata_cache.yaml")
-        self.gcp_client.set_metadata_cache_control(cloud_path="gs://test_bucket/uploaded_blob.txt",cache_control="private, max-age=0, no-store")
-
-    @responses.activate
-    def test_get_most_recent_blob_content(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/read_newest_blob.yaml")
-        data = self.gcp_client.get_file_contents_of_most_recent_blob_in_bucket(bucket_name="test_bucket")
+    def test_acl_group_owner(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/set_acl_group_owner.yaml", mocked_responses)
+        gcp_client.set_acl_group_owner(cloud_path="gs://test_bucket/uploaded_blob.txt", group_email='test_group@firecloud.org')
+
+    def test_metadata_cache_control(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/set_metadata_cache.yaml", mocked_responses)
+        gcp_client.set_metadata_cache_control(cloud_path="gs://test_bucket/uploaded_blob.txt",cache_control="private, max-age=0, no-store")
+
+    def test_get_most_recent_blob_content(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/read_newest_blob.yaml", mocked_responses)
+        data = gcp_client.get_file_contents_of_most_recent_blob_in_bucket(bucket_name="test_bucket")
         assert data
 
 
-    @responses.activate
-    def test_write_to_gcp_file(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/gcp_util/write_to_blob.yaml")
-        self.gcp_client.write_to_gcp_file(cloud_path='gs://test_bucket/blob_to_write.txt', file_contents="test data here")
+    def test_write_to_gcp_file(self, gcp_client, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/gcp_util/write_to_blob.yaml", mocked_responses)
+        gcp_client.write_to_gcp_file(cloud_path='gs://test_bucket/blob_to_write.txt', file_contents="test data here")
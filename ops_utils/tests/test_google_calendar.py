@@ -1,27 +1,40 @@
 from datetime import datetime
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
+from freezegun import freeze_time
 
 from ops_utils.google_calendar import GoogleCalendar
 
 
 class TestGoogleCalendar(TestCase):
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
         # Patch credentials creation
-        self.patcher_creds = patch("ops_utils.google_calendar.service_account.Credentials.from_service_account_info")
-        self.mock_credentials_info = self.patcher_creds.start()
+        cls.patcher_creds = patch("ops_utils.google_calendar.service_account.Credentials.from_service_account_info")
+        cls.mock_credentials_info = cls.patcher_creds.start()
 
         # Patch API service build
-        self.patcher_build = patch("ops_utils.google_calendar.build")
-        self.mock_build = self.patcher_build.start()
+        cls.patcher_build = patch("ops_utils.google_calendar.build")
+        cls.mock_build = cls.patcher_build.start()
 
         # Set return values
-        self.fake_credentials = MagicMock()
-        self.mock_credentials_info.return_value = self.fake_credentials
+        cls.fake_credentials = MagicMock()
+        cls.mock_credentials_info.return_value = cls.fake_credentials
+
+        cls.fake_service = MagicMock()
+        cls.mock_build.return_value = cls.fake_service
 
-        self.fake_service = MagicMock()
-        self.mock_build.return_value = self.fake_service
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher_build.stop()
+        cls.patcher_creds.stop()
+
+    def setUp(self):
+        # Clear calls recorded by previous tests, keeping the configured return values
+        self.mock_credentials_info.reset_mock()
+        self.mock_build.reset_mock()
+        self.fake_service.reset_mock()
 
         # Create the GoogleCalendar instance
         self.fake_info = {"fake": "credentials"}
@@ -49,18 +62,11 @@ class TestGoogleCalendar(TestCase):
         # Assertions
         self.assertEqual(result, expected_result)
 
-    @patch("ops_utils.google_calendar.GoogleCalendar._create_calendar_string_from_datetime")
-    def test_get_events(self, mock_cal_string):
-        # Mock the two calendar strings that get generated so we can actually use the time
-        # stamps for testing
-        mock_cal_string.side_effect = ["2023-01-01T00:00:00Z", "2023-01-10T00:00:00Z"]
-
-        # Mock the return of events().list().execute()
-        mock_events = MagicMock()
-        self.fake_service.events.return_value = mock_events
-        mock_list = MagicMock()
-        mock_events.list.return_value = mock_list
-        mock_list.execute.return_value = {"items": [{"id": "1", "summary": "Test Event"}]}
+    @freeze_time("2023-01-06T12:00:00")
+    def test_get_events(self):
+        # Mock the return of events().list().execute(), keeping a handle on the "list" leaf mock
+        mock_list = self.fake_service.events.return_value.list
+        mock_list.return_value.execute.return_value = {"items": [{"id": "1", "summary": "Test Event"}]}
 
         # Call the method
         events = self.google_calendar.get_events(
@@ -68,10 +74,10 @@ class TestGoogleCalendar(TestCase):
         )
 
         # Assertions
-        mock_events.list.assert_called_once_with(
+        mock_list.assert_called_once_with(
             calendarId="fake_calendar_id",
             timeMin="2023-01-01T00:00:00Z",
-            timeMax="2023-01-10T00:00:00Z",
+            timeMax="2023-01-11T00:00:00Z",
             maxResults=2500,
             singleEvents=True,
             orderBy='startTime'
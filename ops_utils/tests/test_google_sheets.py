@@ -1,41 +1,26 @@
+import pytest
 import unittest
 from ops_utils.google_sheets_util import GoogleSheets
-from unittest.mock import MagicMock, patch
-from google.auth import credentials
 import responses
-import os
+
+from helpers import add_responses_from_file
 
 SPREADSHEET_ID = "1GjeRUYtkkT1bGxVGE4DLHrA5itQGWjvCh0xNWpdHTTQ"
 SHEET_NAME = "Sheet1"
 
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "test_creds.json"
-
-MOCK_CREDENTIALS = MagicMock(spec=credentials.CredentialsWithQuotaProject)
-MOCK_CREDENTIALS.with_quota_project.return_value = MOCK_CREDENTIALS
-MOCK_CREDENTIALS.universe_domain = "googleapis.com"
-
-LOAD_FILE_PATCH = patch(
-    "google.auth._default.load_credentials_from_file",
-    return_value=(MOCK_CREDENTIALS, 'operations-portal-427515'),
-    autospec=True,
-)
-
-def create_google_sheets_client():
-    with LOAD_FILE_PATCH:
-        google_sheets_util = GoogleSheets()
-    return google_sheets_util
-
 
+@pytest.mark.usefixtures("mock_gcp_credentials")
 class TestGoogleSheets(unittest.TestCase):
     """Test suite for GoogleSheets class."""
-    def setUp(self):
-        """Set up the test case."""
-        self.google_sheets_client = create_google_sheets_client()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test case, building the client under the credentials patch only once."""
+        cls.google_sheets_client = GoogleSheets()
 
     @responses.activate
     def test_get_cell_value(self):
         """Test get_cell_value method."""
-        responses._add_from_file(file_path="ops_utils/tests/data/google_sheets_util/get_cell_value.yaml")
+        add_responses_from_file("ops_utils/tests/data/google_sheets_util/get_cell_value.yaml")
         result = self.google_sheets_client.get_cell_value(
             spreadsheet_id=SPREADSHEET_ID,
             worksheet_name=SHEET_NAME,
@@ -46,7 +31,7 @@ class TestGoogleSheets(unittest.TestCase):
     @responses.activate
     def test_get_last_row(self):
         """Test get_last_row method."""
-        responses._add_from_file(file_path="ops_utils/tests/data/google_sheets_util/get_last_row.yaml")
+        add_responses_from_file("ops_utils/tests/data/google_sheets_util/get_last_row.yaml")
         result = self.google_sheets_client.get_last_row(
             spreadsheet_id=SPREADSHEET_ID,
             worksheet_name=SHEET_NAME,
@@ -56,7 +41,7 @@ class TestGoogleSheets(unittest.TestCase):
     @responses.activate
     def test_update_and_get_cell_value(self):
         """Test update_cell method."""
-        responses._add_from_file(file_path="ops_utils/tests/data/google_sheets_util/update_and_get_cell_value.yaml")
+        add_responses_from_file("ops_utils/tests/data/google_sheets_util/update_and_get_cell_value.yaml")
         self.google_sheets_client.update_cell(
             spreadsheet_id=SPREADSHEET_ID,
             worksheet_name=SHEET_NAME,
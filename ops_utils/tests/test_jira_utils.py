@@ -1,69 +1,108 @@
+import io
 import os
-import unittest
 from unittest.mock import patch, MagicMock
+
+import pytest
+
 from ops_utils.jira_util import JiraUtil
 
 
-class TestJiraUtil(unittest.TestCase):
+class StubJira:
+    """Stand-in for the Jira connection that records the calls JiraUtil makes to it."""
+
+    def __init__(self, post_return=None):
+        self.calls = []
+        self.post_return = post_return
+
+    def issue_update(self, *args, **kwargs):
+        self.calls.append(("issue_update", args, kwargs))
+
+    def issue_add_comment(self, *args, **kwargs):
+        self.calls.append(("issue_add_comment", args, kwargs))
+
+    def set_issue_status_by_transition_id(self, *args, **kwargs):
+        self.calls.append(("set_issue_status_by_transition_id", args, kwargs))
+
+    def post(self, *args, **kwargs):
+        self.calls.append(("post", args, kwargs))
+        return self.post_return
+
+
+SERVER = "https://broadinstitute.atlassian.net/"
+GCP_PROJECT_ID = "test-project"
+SECRET_NAME = "test-secret"
 
-    def setUp(self):
-        self.server = "https://broadinstitute.atlassian.net/"
-        self.gcp_project_id = "test-project"
-        self.secret_name = "test-secret"
 
-        self.mock_jira = MagicMock()
-        self.util = JiraUtil.__new__(JiraUtil)
-        self.util.jira_connection = self.mock_jira
+@pytest.fixture
+def stub_jira():
+    return StubJira()
+
+
+@pytest.fixture
+def jira_util(stub_jira):
+    """JiraUtil wired up to stub_jira, skipping the connection setup done in __init__."""
+    util = JiraUtil.__new__(JiraUtil)
+    util.jira_connection = stub_jira
+    return util
+
+
+class TestJiraUtil:
 
     @patch("ops_utils.jira_util.secretmanager.SecretManagerServiceClient")
     @patch("ops_utils.jira_util.Jira")
-    def test_connect_to_jira_with_token_file(self, mock_jira, mock_secret_manager):
-        with patch("builtins.open", unittest.mock.mock_open(read_data="fake-token")):
-            with patch("os.path.expanduser", return_value="/fake/.jira_api_key"):
-                util = JiraUtil(self.server, self.gcp_project_id, self.secret_name)
+    def test_connect_to_jira_with_token_file(self, mock_jira, mock_secret_manager, monkeypatch):
+        # Shadow open for jira_util only, so nothing else reading files during the test is affected
+        monkeypatch.setattr("ops_utils.jira_util.open", lambda path, *args, **kwargs: io.StringIO("fake-token"), raising=False)
+        monkeypatch.setattr("os.path.expanduser", lambda path: "/fake/.jira_api_key")
+        util = JiraUtil(SERVER, GCP_PROJECT_ID, SECRET_NAME)
 
         mock_jira.assert_called_once_with(
-            url=self.server,
+            url=SERVER,
             username=f"{os.getenv('USER')}@broadinstitute.org",
             password="fake-token"
         )
-        self.assertIsNotNone(util.jira_connection)
+        assert util.jira_connection is not None
 
     @patch("ops_utils.jira_util.secretmanager.SecretManagerServiceClient")
     @patch("ops_utils.jira_util.Jira")
-    def test_connect_to_jira_with_secret_manager(self, mock_jira, mock_secret_manager):
+    def test_connect_to_jira_with_secret_manager(self, mock_jira, mock_secret_manager, monkeypatch):
         # make file not found, trigger Secret Manager path
-        with patch("builtins.open", side_effect=FileNotFoundError):
-            mock_client = MagicMock()
-            mock_client.access_secret_version.return_value.payload.data.decode.return_value = "secret-token"
-            mock_secret_manager.return_value = mock_client
+        def raise_file_not_found(path, *args, **kwargs):
+            raise FileNotFoundError(path)
 
-            util = JiraUtil(self.server, self.gcp_project_id, self.secret_name)
+        monkeypatch.setattr("ops_utils.jira_util.open", raise_file_not_found, raising=False)
+        mock_client = MagicMock()
+        mock_client.access_secret_version.return_value.payload.data.decode.return_value = "secret-token"
+        mock_secret_manager.return_value = mock_client
+
+        util = JiraUtil(SERVER, GCP_PROJECT_ID, SECRET_NAME)
 
         mock_jira.assert_called_once_with(
-            url=self.server,
+            url=SERVER,
             username=f"{os.getenv('USER')}@broadinstitute.org",
             password="secret-token"
         )
 
-    def test_update_ticket_fields(self):
-        self.util.update_ticket_fields("ISSUE-1", {"field": "value"})
-        self.mock_jira.issue_update.assert_called_once_with("ISSUE-1", {"field": "value"})
-
-    def test_add_comment(self):
-        self.util.add_comment("ISSUE-2", "test comment")
-        self.mock_jira.issue_add_comment.assert_called_once_with("ISSUE-2", "test comment")
-
-    def test_transition_ticket(self):
-        self.util.transition_ticket("ISSUE-3", 123)
-        self.mock_jira.set_issue_status_by_transition_id.assert_called_once_with("ISSUE-3", 123)
-
-    def test_get_issues_by_criteria(self):
-        self.mock_jira.post.return_value = {"issues": []}
+    @pytest.mark.parametrize(
+        "method,args,jira_method",
+        [
+            ("update_ticket_fields", ("ISSUE-1", {"field": "value"}), "issue_update"),
+            ("add_comment", ("ISSUE-2", "test comment"), "issue_add_comment"),
+            ("transition_ticket", ("ISSUE-3", 123), "set_issue_status_by_transition_id"),
+        ],
+        ids=["update_ticket_fields", "add_comment", "transition_ticket"],
+    )
+    def test_passthrough_methods(self, jira_util, stub_jira, method, args, jira_method):
+        # Each of these methods forwards its arguments unchanged to a single Jira call
+        getattr(jira_util, method)(*args)
+        assert stub_jira.calls == [(jira_method, args, {})]
+
+    def test_get_issues_by_criteria(self, jira_util, stub_jira):
+        stub_jira.post_return = {"issues": []}
 
         criteria = "project = TEST"
         fields = ["summary", "status"]
-        result = self.util.get_issues_by_criteria(criteria, max_results=50, fields=fields, expand_info="changelog")
+        result = jira_util.get_issues_by_criteria(criteria, max_results=50, fields=fields, expand_info="changelog")
 
         expected_payload = {
             "jql": criteria,
@@ -72,5 +111,5 @@ class TestJiraUtil(unittest.TestCase):
             "expand": "changelog"
         }
 
-        self.mock_jira.post.assert_called_once_with("rest/api/3/search/jql", data=expected_payload)
-        self.assertEqual(result, {"issues": []})
+        assert stub_jira.calls == [("post", ("rest/api/3/search/jql",), {"data": expected_payload})]
+        assert result == {"issues": []}
@@ -1,225 +1,266 @@
-from unittest import TestCase
-from unittest.mock import patch, MagicMock
+from types import MappingProxyType
+from unittest.mock import MagicMock
 
+import pytest
+
+from ops_utils.gcp_utils import GCPCloudFunctions
 from ops_utils.tdr_utils.renaming_util import (
     GetRowAndFileInfoForReingest,
     BatchCopyAndIngest,
 )
+from ops_utils.tdr_utils.tdr_api_utils import TDR
 
 
-class TestGetRowAndFileInfoForReingest(TestCase):
-    def setUp(self):
-        dataset_id = "fake-dataset-id"
-        self.tdr_table_schema = {
-            'name': 'sample',
-            'columns': [
-                {'name': 'sample_id', 'datatype': 'string', 'array_of': False, 'required': True},
-                {'name': 'data_type', 'datatype': 'string', 'array_of': False, 'required': False},
-                {'name': 'fastq1_path', 'datatype': 'fileref', 'array_of': False, 'required': False},
-                {'name': 'collaborator_sample_id', 'datatype': 'string', 'array_of': False, 'required': False},
-            ],
-            'primaryKey': ['sample_id'],
-            'partitionMode': 'none',
-            'datePartitionOptions': None,
-            'intPartitionOptions': None,
-            'rowCount': None
-        }
-
-        self.files_dict = {
-            '38438b22-5d73-41e9-8ee7-ea6e5c65e731': {
-                'fileId': '38438b22-5d73-41e9-8ee7-ea6e5c65e731',
-                'collectionId': dataset_id,
-                'path': '/some_path/file.fastq1',
-                'size': 12,
-                'checksums': [{'checksum': 'cfeeffcf', 'type': 'crc32c'}, {'checksum': '4fa151e95de9165038536a4001cd2e5e', 'type': 'md5'}],
-                'created': '2024-07-11T14:27:43.218Z',
-                'description': None,
-                'fileType': 'file',
-                'fileDetail': {
-                    'datasetId': dataset_id,
-                    'mimeType': None,
-                    'accessUrl': 'gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq',
-                    'loadTag': 'fake-load-tag'
-                },
-                'directoryDetail': None
-            },
-        }
-
-        self.table_metrics = [
-            {
-                "sample_id": "fake-sample-id",
-                "fastq1_path": "38438b22-5d73-41e9-8ee7-ea6e5c65e731",
-                "data_type": "WGS",
-                "collaborator_sample_id": "fake-collab-sample-id",
-            }
-        ]
+DATASET_ID = "fake-dataset-id"
+FILE_ID = "38438b22-5d73-41e9-8ee7-ea6e5c65e731"
+
+# Where the file currently lives in TDR
+ACCESS_URL = f"gs://datarepo-8919718-bucket/{DATASET_ID}/{FILE_ID}/some_path/fake-sample-id.fastq"
+# Where the renamed copy goes in the temp bucket, and its new TDR metadata path
+TEMP_PATH = f"fake-temp-bucket/datarepo-8919718-bucket/{DATASET_ID}/{FILE_ID}/some_path/fake-collab-sample-id.fastq"
+RENAMED_METADATA_PATH = "/some_path/fake-collab-sample-id.fastq"
+# Temp and TDR metadata paths for the file when its basename doesn't change
+UNRENAMED_TEMP_PATH = f"fake-temp-bucket/datarepo-8919718-bucket/{DATASET_ID}/{FILE_ID}/some_path/fake-sample-id.fastq"
+UNRENAMED_METADATA_PATH = "/some_path/fake-sample-id.fastq"
+
+# Read-only inputs shared by every TestGetRowAndFileInfoForReingest test
+TDR_TABLE_SCHEMA = MappingProxyType({
+    'name': 'sample',
+    'columns': [
+        {'name': 'sample_id', 'datatype': 'string', 'array_of': False, 'required': True},
+        {'name': 'data_type', 'datatype': 'string', 'array_of': False, 'required': False},
+        {'name': 'fastq1_path', 'datatype': 'fileref', 'array_of': False, 'required': False},
+        {'name': 'collaborator_sample_id', 'datatype': 'string', 'array_of': False, 'required': False},
+    ],
+    'primaryKey': ['sample_id'],
+    'partitionMode': 'none',
+    'datePartitionOptions': None,
+    'intPartitionOptions': None,
+    'rowCount': None
+})
+
+FILES_DICT = MappingProxyType({
+    FILE_ID: {
+        'fileId': FILE_ID,
+        'collectionId': DATASET_ID,
+        'path': '/some_path/file.fastq1',
+        'size': 12,
+        'checksums': [{'checksum': 'cfeeffcf', 'type': 'crc32c'}, {'checksum': '4fa151e95de9165038536a4001cd2e5e', 'type': 'md5'}],
+        'created': '2024-07-11T14:27:43.218Z',
+        'description': None,
+        'fileType': 'file',
+        'fileDetail': {
+            'datasetId': DATASET_ID,
+            'mimeType': None,
+            'accessUrl': ACCESS_URL,
+            'loadTag': 'fake-load-tag'
+        },
+        'directoryDetail': None
+    },
+})
+
+TABLE_METRICS = (
+    MappingProxyType({
+        "sample_id": "fake-sample-id",
+        "fastq1_path": FILE_ID,
+        "data_type": "WGS",
+        "collaborator_sample_id": "fake-collab-sample-id",
+    }),
+)
+
+# The re-ingest row and the copy to the temp bucket expected for TABLE_METRICS[0]
+EXPECTED_INGEST_ROW = MappingProxyType({
+    'sample_id': 'fake-sample-id',
+    'fastq1_path': MappingProxyType({
+        'sourcePath': TEMP_PATH,
+        'targetPath': RENAMED_METADATA_PATH
+    })
+})
+EXPECTED_FILE_COPY = MappingProxyType({
+    'source_file': ACCESS_URL,
+    'full_destination_path': TEMP_PATH
+})
+
+
+@pytest.fixture(scope="module")
+def tdr_mock_template():
+    """Build the spec'd TDR mock once per module, since working out the spec is the expensive part."""
+    return MagicMock(spec=TDR)
 
-        self.original_column = "sample_id"
-        self.new_column = "collaborator_sample_id"
-        self.row_file_info = GetRowAndFileInfoForReingest(
-            table_schema_info=self.tdr_table_schema,
-            files_info=self.files_dict,
-            table_metrics=self.table_metrics,
-            row_identifier=self.original_column,
-            original_column=self.original_column,
-            new_column=self.new_column,
-            temp_bucket="fake-temp-bucket",
-        )
 
-    def test_get_new_copy_and_ingest_list(self):
+ORIGINAL_COLUMN = "sample_id"
+NEW_COLUMN = "collaborator_sample_id"
+
+
+@pytest.fixture
+def row_file_info():
+    return GetRowAndFileInfoForReingest(
+        table_schema_info=TDR_TABLE_SCHEMA,
+        files_info=FILES_DICT,
+        table_metrics=TABLE_METRICS,
+        row_identifier=ORIGINAL_COLUMN,
+        original_column=ORIGINAL_COLUMN,
+        new_column=NEW_COLUMN,
+        temp_bucket="fake-temp-bucket",
+    )
+
+
+class TestGetRowAndFileInfoForReingest:
+
+    def test_get_new_copy_and_ingest_list(self, row_file_info):
         # Run the method
-        actual_ingest_list, actual_files_to_copy = self.row_file_info.get_new_copy_and_ingest_list()
+        actual_ingest_list, actual_files_to_copy = row_file_info.get_new_copy_and_ingest_list()
         # We expect that the sample_id in the file name gets replaced with the collaborator_sample_id
-        expected_ingest_list = [
-            {
-                'sample_id': 'fake-sample-id',
-                'fastq1_path': {
-                    'sourcePath': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq',
-                    'targetPath': '/some_path/fake-collab-sample-id.fastq'
-                }
-            }
-        ]
-        expected_files_to_copy = [
-                [
-                    {
-                        'source_file': 'gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq',
-                        'full_destination_path': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq'
-                    }
-                ]
-        ]
+        # Assertions
+        assert [[EXPECTED_FILE_COPY]] == actual_files_to_copy
+        assert [EXPECTED_INGEST_ROW] == actual_ingest_list
+
+    def test_get_new_copy_and_ingest_list_many_rows(self):
+        # Checks every row is converted when many rows reference the same file
+        row_count = 10_000
+        row_file_info = GetRowAndFileInfoForReingest(
+            table_schema_info=TDR_TABLE_SCHEMA,
+            files_info=FILES_DICT,
+            table_metrics=TABLE_METRICS * row_count,
+            row_identifier=ORIGINAL_COLUMN,
+            original_column=ORIGINAL_COLUMN,
+            new_column=NEW_COLUMN,
+            temp_bucket="fake-temp-bucket",
+        )
 
+        # Run the method
+        actual_ingest_list, actual_files_to_copy = row_file_info.get_new_copy_and_ingest_list()
 
         # Assertions
-        self.assertEqual(expected_files_to_copy, actual_files_to_copy)
-        self.assertEqual(expected_ingest_list, actual_ingest_list)
+        assert len(actual_ingest_list) == row_count
+        assert len(actual_files_to_copy) == row_count
+        assert row_file_info.total_files_to_reingest == row_count
+        assert actual_ingest_list[-1] == EXPECTED_INGEST_ROW
 
-    def test_create_paths(self):
-        file_info = self.files_dict["38438b22-5d73-41e9-8ee7-ea6e5c65e731"]
+    def test_create_paths(self, row_file_info):
+        file_info = FILES_DICT[FILE_ID]
 
         # Run the method
-        temp_path, updated_metadata_path, access_url = self.row_file_info._create_paths(
+        temp_path, updated_metadata_path, access_url = row_file_info._create_paths(
             file_info=file_info,
-            og_basename=self.original_column,
-            new_basename=self.new_column
+            og_basename=ORIGINAL_COLUMN,
+            new_basename=NEW_COLUMN
         )
         # Assertions
-        self.assertEqual(temp_path, "fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq")
-        self.assertEqual(updated_metadata_path, "/some_path/fake-sample-id.fastq")
-        self.assertEqual(access_url, "gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq")
+        assert temp_path == UNRENAMED_TEMP_PATH
+        assert updated_metadata_path == UNRENAMED_METADATA_PATH
+        assert access_url == ACCESS_URL
 
-    def test_create_row_dict(self):
-        row_dict = self.table_metrics[0]
+    def test_create_row_dict(self, row_file_info):
+        row_dict = TABLE_METRICS[0]
 
         # Run the method
-        new_row_dict, tmp_copy_list = self.row_file_info._create_row_dict(row_dict=row_dict, file_ref_columns=["fastq1_path"])
+        new_row_dict, tmp_copy_list = row_file_info._create_row_dict(row_dict=row_dict, file_ref_columns=["fastq1_path"])
 
         # Assertions
-        self.assertEqual(
-            new_row_dict,
-            {
-                'sample_id': 'fake-sample-id',
-                'fastq1_path': {
-                    'sourcePath': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq',
-                    'targetPath': '/some_path/fake-collab-sample-id.fastq'
-                }
-            }
-        )
-        self.assertEqual(
-            tmp_copy_list,
-            [
-                {
-                    'source_file': 'gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq',
-                    'full_destination_path': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq'
-                }
-            ]
-        )
+        assert new_row_dict == EXPECTED_INGEST_ROW
+        assert tmp_copy_list == [EXPECTED_FILE_COPY]
 
-class TestBatchCopyAndIngest(TestCase):
 
-    @patch("ops_utils.tdr_utils.renaming_util.TDR")
-    def setUp(self, mock_tdr):
-        self.mock_tdr = mock_tdr
+TABLE_NAME = "sample"
+UPDATE_STRATEGY = "merge"
 
-        # Mock the TDR instance
-        self.mock_tdr_instance = MagicMock()
-        self.mock_tdr_instance.return_value = self.mock_tdr
 
+@pytest.fixture
+def mock_tdr(tdr_mock_template):
+    # Reuse the module's TDR mock, clearing the calls left by the previous test.
+    # BatchCopyAndIngest takes it as an argument, so nothing needs patching
+    tdr_mock_template.reset_mock(return_value=True, side_effect=True)
+    return tdr_mock_template
+
+
+@pytest.fixture
+def batch_copy(mock_tdr):
+    # Feed in what GetRowAndFileInfoForReingest produces for TABLE_METRICS
+    return BatchCopyAndIngest(
+        rows_to_ingest=[EXPECTED_INGEST_ROW],
+        tdr=mock_tdr,
+        target_table_name=TABLE_NAME,
+        update_strategy=UPDATE_STRATEGY,
+        dataset_id=DATASET_ID,
+        row_files_to_copy=[[EXPECTED_FILE_COPY]],
+    )
+
+
+class RecordingGCP(GCPCloudFunctions):
+    """GCPCloudFunctions that records copies and deletes instead of making them."""
+
+    def __init__(self):
+        # Skip building a storage client, nothing here talks to GCS
+        self.recorded_calls = []
+
+    def multithread_copy_of_files_with_validation(self, **kwargs):
+        self.recorded_calls.append(("multithread_copy_of_files_with_validation", kwargs))
+
+    def delete_multiple_files(self, **kwargs):
+        self.recorded_calls.append(("delete_multiple_files", kwargs))
 
-        self.rows_to_ingest = [
-            {
-                'sample_id': 'fake-sample-id',
-                'fastq1_path': {
-                    'sourcePath': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq',
-                    'targetPath': '/some_path/fake-collab-sample-id.fastq'
-                }
-            }
-        ]
-        self.row_files_to_copy = [
-            [
-                {
-                    'source_file': 'gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq',
-                    'full_destination_path': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq'
-                }
-            ]
-        ]
-        self.dataset_id = "fake-dataset-id"
-        self.table_name = "sample"
-        self.update_strategy = "merge"
-
-        self.batch_copy = BatchCopyAndIngest(
-            rows_to_ingest=self.rows_to_ingest,
-            tdr=self.mock_tdr_instance,
-            target_table_name=self.table_name,
-            update_strategy=self.update_strategy,
-            dataset_id=self.dataset_id,
-            row_files_to_copy=self.row_files_to_copy,
-        )
 
-    @patch("ops_utils.tdr_utils.renaming_util.GCPCloudFunctions")
-    @patch("ops_utils.tdr_utils.renaming_util.StartAndMonitorIngest")
-    def test_run(self, mock_ingest, mock_gcp):
-        mock_gcp_instance = MagicMock()
-        mock_gcp.return_value = mock_gcp_instance
+class RecordingStartAndMonitorIngest:
+    """Stand-in for StartAndMonitorIngest that records how it was built and run."""
 
-        mock_ingest_instance = MagicMock()
-        mock_ingest.return_value = mock_ingest_instance
+    def __init__(self, **kwargs):
+        self.init_kwargs = kwargs
+        self.run_count = 0
 
+    def run(self):
+        self.run_count += 1
+
+
+@pytest.fixture
+def recording_gcp(monkeypatch):
+    gcp = RecordingGCP()
+    monkeypatch.setattr("ops_utils.tdr_utils.renaming_util.GCPCloudFunctions", lambda: gcp)
+    return gcp
+
+
+@pytest.fixture
+def recorded_ingests(monkeypatch):
+    ingests = []
+
+    def start_and_monitor_ingest(**kwargs):
+        ingests.append(RecordingStartAndMonitorIngest(**kwargs))
+        return ingests[-1]
+
+    monkeypatch.setattr("ops_utils.tdr_utils.renaming_util.StartAndMonitorIngest", start_and_monitor_ingest)
+    return ingests
+
+
+class TestBatchCopyAndIngest:
+
+    def test_run(self, batch_copy, mock_tdr, recording_gcp, recorded_ingests):
         # Run the method
-        self.batch_copy.run()
+        batch_copy.run()
 
         # Assertions
-        files_to_copy = [
-            {
-                'source_file': 'gs://datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-sample-id.fastq',
-                'full_destination_path': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq'
-            }
+        assert [ingest.init_kwargs for ingest in recorded_ingests] == [
+            dict(
+                tdr=mock_tdr,
+                ingest_records=[EXPECTED_INGEST_ROW],
+                target_table_name=TABLE_NAME,
+                dataset_id=DATASET_ID,
+                load_tag=f"{TABLE_NAME}_re-ingest",
+                bulk_mode=False,
+                update_strategy=UPDATE_STRATEGY,
+                waiting_time_to_poll=90
+            )
         ]
-        mock_gcp_instance.multithread_copy_of_files_with_validation.assert_called_once_with(
-            files_to_copy=files_to_copy,
-            workers=10,
-            max_retries=5
-        )
-        ingest_records = [
-            {
-                'sample_id': 'fake-sample-id',
-                'fastq1_path': {
-                    'sourcePath': 'fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq',
-                    'targetPath': '/some_path/fake-collab-sample-id.fastq'
-                }
-            }
+        assert recorded_ingests[0].run_count == 1
+        assert recording_gcp.recorded_calls == [
+            (
+                "multithread_copy_of_files_with_validation",
+                dict(files_to_copy=[EXPECTED_FILE_COPY], workers=10, max_retries=5)
+            ),
+            (
+                "delete_multiple_files",
+                dict(
+                    files_to_delete=[TEMP_PATH],
+                    workers=10,
+                )
+            ),
         ]
-        mock_ingest.assert_called_once_with(
-            tdr=self.mock_tdr_instance,
-            ingest_records=ingest_records,
-            target_table_name=self.table_name,
-            dataset_id=self.dataset_id,
-            load_tag=f"{self.table_name}_re-ingest",
-            bulk_mode=False,
-            update_strategy=self.update_strategy,
-            waiting_time_to_poll=90
-        )
-        mock_ingest_instance.run.assert_called_once()
-        mock_gcp_instance.delete_multiple_files.assert_called_once_with(
-            files_to_delete=['fake-temp-bucket/datarepo-8919718-bucket/fake-dataset-id/38438b22-5d73-41e9-8ee7-ea6e5c65e731/some_path/fake-collab-sample-id.fastq'],
-            workers=10,
-        )
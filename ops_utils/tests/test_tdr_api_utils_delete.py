@@ -0,0 +1,45 @@
+from _tdr_constants import TEST_DATASET_ID, TABLE_NAME
+from helpers import add_responses_from_file
+
+
+class TestTDRDeletes:
+
+    def test_soft_delete_entries(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/soft_delete_entries.yaml", mocked_responses)
+        tdr_util.soft_delete_entries(
+            dataset_id=TEST_DATASET_ID,
+            table_name=TABLE_NAME,
+            datarepo_row_ids=['10983270-be5b-4f03-b3c8-52b51797a31e', '72c016f1-2ed9-4d15-9e71-2a4d6ca7a4a1']
+        )
+        assert True
+
+    def test_soft_delete_all_table_entries(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/soft_delete_all_table_entries.yaml", mocked_responses)
+        tdr_util.soft_delete_all_table_entries(
+            dataset_id=TEST_DATASET_ID,
+            table_name=TABLE_NAME
+        )
+        assert True
+
+    def test_delete_file(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/delete_file.yaml", mocked_responses)
+        job_id = tdr_util.delete_file(
+            dataset_id=TEST_DATASET_ID,
+            file_id="99bf3bbd-5610-4c93-90a1-48d0cf168a6d"
+        ).json()["id"]
+        assert job_id
+
+    def test_delete_files(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/delete_files.yaml", mocked_responses)
+        tdr_util.delete_files(
+            dataset_id=TEST_DATASET_ID,
+            file_ids=["ae2438c7-23ef-46e3-80c7-d8a3ef72fe54", "67c43183-4109-4f24-9744-dfa77ccac72c"]
+        )
+        assert True
+
+    def test_delete_dataset(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/delete_dataset.yaml", mocked_responses)
+        tdr_util.delete_dataset(
+            dataset_id=TEST_DATASET_ID,
+        )
+        assert True
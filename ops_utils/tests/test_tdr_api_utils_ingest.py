@@ -0,0 +1,73 @@
+from _tdr_constants import TEST_DATASET_ID, TABLE_NAME, TEST_INGEST_METRICS, TEST_INGEST_REQUEST_JSON
+from helpers import add_responses_from_file
+from ops_utils.tdr_utils.tdr_api_utils import FilterOutSampleIdsAlreadyInDataset
+
+
+class TestTDRIngestAndMetadata:
+
+    def test_get_dataset_files(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_dataset_files.yaml", mocked_responses)
+        dataset_files = tdr_util.get_dataset_files(
+            dataset_id=TEST_DATASET_ID,
+        )
+        assert len(dataset_files) == 3
+
+    def test_ingest_to_dataset(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/ingest_to_dataset.yaml", mocked_responses)
+        response = tdr_util.ingest_to_dataset(
+            dataset_id=TEST_DATASET_ID,
+            data=TEST_INGEST_REQUEST_JSON
+        ).json()
+        assert response
+
+    def test_create_file_dict(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/create_file_dict.yaml", mocked_responses)
+        dataset_details = tdr_util.create_file_dict(
+            dataset_id=TEST_DATASET_ID,
+        )
+        assert len(dataset_details) == 3
+        assert '99bf3bbd-5610-4c93-90a1-48d0cf168a6d' in dataset_details
+
+    def test_get_dataset_table_metrics(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_dataset_table_metrics.yaml", mocked_responses)
+        table_metrics = tdr_util.get_dataset_table_metrics(
+            dataset_id=TEST_DATASET_ID,
+            target_table_name=TABLE_NAME,
+        )
+        assert table_metrics[0]['file_1'] == "67c43183-4109-4f24-9744-dfa77ccac72c"
+        assert table_metrics[0]['sample_id'] == "sample1"
+
+    def test_get_dataset_sample_ids(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_dataset_sample_ids.yaml", mocked_responses)
+        sample_ids = tdr_util.get_dataset_sample_ids(
+            dataset_id=TEST_DATASET_ID,
+            target_table_name=TABLE_NAME,
+            entity_id="sample_id"
+        )
+        assert len(sample_ids) == 6
+        assert "sample1" in sample_ids
+
+    def test_get_dataset_file_uuids_from_metadata(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_dataset_file_uuids_from_metadata.yaml", mocked_responses)
+        file_uuids = tdr_util.get_dataset_file_uuids_from_metadata(dataset_id=TEST_DATASET_ID)
+        assert len(file_uuids) == 3
+        assert "99bf3bbd-5610-4c93-90a1-48d0cf168a6d" in file_uuids
+
+    def test_filter_out_sample_ids_already_in_dataset(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/filter_out_sample_ids_already_in_dataset.yaml", mocked_responses)
+        ingest_metrics = TEST_INGEST_METRICS + [{
+                "sample_id": "sample4",
+                "file_1": {
+                    "sourcePath": "gs://fc-90271ac6-9449-462c-ae97-71d6fad6b669/test.xlsx",
+                    "targetPath": "/test.xlsx",
+                }
+            }
+        ]
+        results = FilterOutSampleIdsAlreadyInDataset(
+            ingest_metrics=ingest_metrics,
+            dataset_id=TEST_DATASET_ID,
+            tdr=tdr_util,
+            target_table_name=TABLE_NAME,
+            filter_entity_id='sample_id'
+        ).run()
+        assert len(results) == 1
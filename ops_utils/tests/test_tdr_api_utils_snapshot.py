@@ -0,0 +1,27 @@
+from _tdr_constants import TEST_DATASET_ID, SNAPSHOT_ID
+from helpers import add_responses_from_file
+
+
+class TestTDRSnapshots:
+
+    def test_get_dataset_snapshots(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_dataset_snapshots.yaml", mocked_responses)
+        snapshots_dict = tdr_util.get_dataset_snapshots(
+            dataset_id=TEST_DATASET_ID,
+        ).json()
+        assert snapshots_dict['items'][0]['id'] == SNAPSHOT_ID
+
+    def test_get_files_from_snapshot(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_files_from_snapshot.yaml", mocked_responses)
+        files_dict = tdr_util.get_files_from_snapshot(
+            snapshot_id=SNAPSHOT_ID,
+        )
+        assert len(files_dict) == 2
+        assert files_dict[0]['fileId'] == "89135808-96ec-4500-af05-f6bf6b7301f3"
+
+    def test_get_snapshot_info(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_util/get_snapshot_info.yaml", mocked_responses)
+        snapshot_info = tdr_util.get_snapshot_info(
+            snapshot_id=SNAPSHOT_ID
+        ).json()
+        assert snapshot_info['id'] == SNAPSHOT_ID
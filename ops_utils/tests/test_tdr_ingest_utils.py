@@ -1,8 +1,6 @@
-import responses
-from unittest.mock import MagicMock
+import pytest
 
-from ops_utils.request_util import RunRequest
-from ops_utils.tdr_utils.tdr_api_utils import TDR
+from helpers import add_responses_from_file
 from ops_utils.terra_util import TerraWorkspace
 from ops_utils.tdr_utils.tdr_ingest_utils import (
     ConvertTerraTableInfoForIngest,
@@ -10,22 +8,61 @@ from ops_utils.tdr_utils.tdr_ingest_utils import (
     FilterAndBatchIngest
 )
 
-mock_token = MagicMock()
-request_util = RunRequest(token=mock_token)
-
 TEST_DATASET_ID = "882da372-ab26-4598-b9d2-bca61806e6f7"
 TEST_BILLING_PROJECT = "ops-integration-billing"
 TEST_WORKSPACE_NAME = "sn_testing_Staging"
 
+SAMPLE_SCHEMA_INFO = {
+    "name": "sample",
+    "columns": [
+        {
+            "name": "sample_id",
+            "datatype": "string",
+            "array_of": False,
+            "required": True
+        },
+        {
+            "name": "column_a",
+            "datatype": "string",
+            "array_of": False,
+            "required": False
+        },
+        {
+            "name": "column_b",
+            "datatype": "string",
+            "array_of": False,
+            "required": False
+        },
+        {
+            "name": "column_c",
+            "datatype": "string",
+            "array_of": False,
+            "required": False
+        },
+        {
+            "name": "test_file",
+            "datatype": "fileref",
+            "array_of": False,
+            "required": False
+        }
+    ],
+    "primaryKey": [
+        "sample_id"
+    ]
+}
 
-class TestTDRIngestUtils:
-    tdr = TDR(request_util=request_util)
-    workspace = TerraWorkspace(
+
+@pytest.fixture(scope="module")
+def workspace(request_util):
+    return TerraWorkspace(
         billing_project=TEST_BILLING_PROJECT,
         workspace_name=TEST_WORKSPACE_NAME,
         request_util=request_util
     )
 
+
+class TestTDRIngestUtils:
+
     def test_convert_terra_table_info_for_ingest(self):
         terra_metrics = [
             {'attributes': {'column_a': 'aksfj', 'column_c': 'bbb', 'column_b': 'eugneu'}, 'entityType': 'sample', 'name': 'sample_a'}, {'attributes': {'column_a': '390f', 'column_c': 'fnnnf', 'column_b': 'jfa9f'}, 'entityType': 'sample', 'name': 'sample_b'}, {'attributes': {'column_a': '3jj39fj', 'column_c': '000sf9', 'column_b': 'jffnai'}, 'entityType': 'sample', 'name': 'sample_c'}
@@ -38,22 +75,22 @@ class TestTDRIngestUtils:
         expected_converted_metrics = [{'sample_id': 'sample_a', 'column_c': 'bbb', 'column_b': 'eugneu'}, {'sample_id': 'sample_b', 'column_c': 'fnnnf', 'column_b': 'jfa9f'}, {'sample_id': 'sample_c', 'column_c': '000sf9', 'column_b': 'jffnai'}]
         assert converted_metrics == expected_converted_metrics
 
-    @responses.activate
-    def test_get_permissions_for_workspace_ingest(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/tdr_ingest_util/get_permissions_for_workspace_ingest.yaml")
-        dataset_info = self.tdr.get_dataset_info(dataset_id=TEST_DATASET_ID).json()
+    def test_get_permissions_for_workspace_ingest(self, tdr_util, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_ingest_util/get_permissions_for_workspace_ingest.yaml", mocked_responses)
+        dataset_info = tdr_util.get_dataset_info(dataset_id=TEST_DATASET_ID).json()
         GetPermissionsForWorkspaceIngest(
-            terra_workspace=self.workspace,
+            terra_workspace=workspace,
             dataset_info=dataset_info,
             added_to_auth_domain=True,
         ).run()
-        assert True
+        # Dataset lookup, then the workspace ACL update and the auth domain check
+        assert [call.request.method for call in mocked_responses.calls] == ["GET", "PATCH", "GET"]
+        assert "/acl" in mocked_responses.calls[1].request.url
 
-    @responses.activate
-    def test_filter_and_batch_ingest(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/tdr_ingest_util/filter_and_batch_ingest.yaml")
+    def test_filter_and_batch_ingest(self, tdr_util, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/tdr_ingest_util/filter_and_batch_ingest.yaml", mocked_responses)
         FilterAndBatchIngest(
-            tdr=self.tdr,
+            tdr=tdr_util,
             filter_existing_ids=True,
             unique_id_field="sample_id",
             table_name="sample",
@@ -73,43 +110,9 @@ class TestTDRIngestUtils:
             load_tag="test_load_tag",
             test_ingest=False,
             file_to_uuid_dict={'/fake/file': 'fake_uuid'},
-            schema_info={
-                "name": "sample",
-                "columns": [
-                    {
-                        "name": "sample_id",
-                        "datatype": "string",
-                        "array_of": False,
-                        "required": True
-                    },
-                    {
-                        "name": "column_a",
-                        "datatype": "string",
-                        "array_of": False,
-                        "required": False
-                    },
-                    {
-                        "name": "column_b",
-                        "datatype": "string",
-                        "array_of": False,
-                        "required": False
-                    },
-                    {
-                        "name": "column_c",
-                        "datatype": "string",
-                        "array_of": False,
-                        "required": False
-                    },
-                    {
-                        "name": "test_file",
-                        "datatype": "fileref",
-                        "array_of": False,
-                        "required": False
-                    }
-                ],
-                "primaryKey": [
-                    "sample_id"
-                ]
-            }
+            schema_info=SAMPLE_SCHEMA_INFO
         ).run()
-        assert True
\ No newline at end of file
+        # An ingest job was started and polled until it succeeded
+        assert any(call.request.url.endswith("/ingest") for call in mocked_responses.calls)
+        assert "/jobs/" in mocked_responses.calls[-1].request.url
+        assert mocked_responses.calls[-1].response.status_code == 200
@@ -6,9 +6,11 @@ from ops_utils.tdr_utils.tdr_schema_utils import InferTDRSchema
 
 class TestInferTDRSchema(TestCase):
 
-    def setUp(self):
-        self.table_name = "fake-table"
-        self.test_metadata_uniform = [
+    @classmethod
+    def setUpClass(cls):
+        # The fixtures are only read by the tests, so build them once for the class
+        cls.table_name = "fake-table"
+        cls.test_metadata_uniform = [
             {
                 "column_a": "foo",
                 "column_b": 100,
@@ -21,7 +23,7 @@ class TestInferTDRSchema(TestCase):
             }
         ]
 
-        self.test_metadata_non_uniform = [
+        cls.test_metadata_non_uniform = [
             {
                 "column_a": "foo",
                 "column_b": "100",
@@ -34,16 +36,16 @@ class TestInferTDRSchema(TestCase):
             }
         ]
 
-        self.infer_tdr_schema = InferTDRSchema(
-            input_metadata=self.test_metadata_uniform,
-            table_name=self.table_name,
+        cls.infer_tdr_schema = InferTDRSchema(
+            input_metadata=cls.test_metadata_uniform,
+            table_name=cls.table_name,
             all_fields_non_required=False,
             allow_disparate_data_types_in_column=False,
         )
 
-        self.infer_tdr_schema_nonuniform = InferTDRSchema(
-            input_metadata=self.test_metadata_non_uniform,
-            table_name=self.table_name,
+        cls.infer_tdr_schema_nonuniform = InferTDRSchema(
+            input_metadata=cls.test_metadata_non_uniform,
+            table_name=cls.table_name,
             all_fields_non_required=False,
             allow_disparate_data_types_in_column=False
         )
@@ -126,38 +128,21 @@ class TestInferTDRSchema(TestCase):
         ]
         self.assertEqual(actual_disparate_header_info, expected_disparate_header_info)
 
-    def test_python_type_to_tdr_type_conversion_file_ref(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=["gs://bucket/some/file.txt"])
-        self.assertEqual(res, "fileref")
-
-    def test_python_type_to_tdr_type_conversion_boolean(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[True])
-        self.assertEqual(res, "boolean")
-
-    def test_python_type_to_tdr_type_conversion_list_of_booleans(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[[True], [True, False], [False]])
-        self.assertEqual(res, "boolean")
-
-    def test_python_type_to_tdr_type_conversion_ints(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[1.0, 2, 3.0])
-        self.assertEqual(res, "int64")
-
-    def test_python_type_to_tdr_type_conversion_floats(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[1.1, 2.2, 3.3])
-        self.assertEqual(res, "float64")
-
-    def test_python_type_to_tdr_type_conversion_float_and_ints(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[1.1, 2, 3.0])
-        self.assertEqual(res, "float64")
-
-    def test_python_type_to_tdr_type_conversion_list_of_ints(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[[1.0, 2], [3, 4.0], [5]])
-        self.assertEqual(res, "int64")
-
-    def test_python_type_to_tdr_type_conversion_list_of_floats(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[[1.0, 2.2], [3.4, 4.1], [5.9]])
-        self.assertEqual(res, "float64")
 
-    def test_python_type_to_tdr_type_conversion_list_of_floats_and_ints(self):
-        res = self.infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=[[1.0, 2], [3.4, 4.1], [5.0]])
-        self.assertEqual(res, "float64")
\ No newline at end of file
+@pytest.mark.parametrize(
+    "values_for_header,expected_type",
+    [
+        pytest.param(["gs://bucket/some/file.txt"], "fileref", id="file_ref"),
+        pytest.param([True], "boolean", id="boolean"),
+        pytest.param([[True], [True, False], [False]], "boolean", id="list_of_booleans"),
+        pytest.param([1.0, 2, 3.0], "int64", id="ints"),
+        pytest.param([1.1, 2.2, 3.3], "float64", id="floats"),
+        pytest.param([1.1, 2, 3.0], "float64", id="float_and_ints"),
+        pytest.param([[1.0, 2], [3, 4.0], [5]], "int64", id="list_of_ints"),
+        pytest.param([[1.0, 2.2], [3.4, 4.1], [5.9]], "float64", id="list_of_floats"),
+        pytest.param([[1.0, 2], [3.4, 4.1], [5.0]], "float64", id="list_of_floats_and_ints"),
+    ],
+)
+def test_python_type_to_tdr_type_conversion(values_for_header, expected_type):
+    infer_tdr_schema = InferTDRSchema(input_metadata=[], table_name="fake-table")
+    assert infer_tdr_schema._python_type_to_tdr_type_conversion(values_for_header=values_for_header) == expected_type
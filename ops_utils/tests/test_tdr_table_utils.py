@@ -1,13 +1,18 @@
+import copy
+import pytest
+from types import MappingProxyType
 from unittest import TestCase
-from unittest.mock import patch, MagicMock, call
+from unittest.mock import patch, MagicMock
 
+from ops_utils.tdr_utils.tdr_api_utils import TDR
 from ops_utils.tdr_utils.tdr_table_utils import SetUpTDRTables, MatchSchemas
 
 TARGET_TABLE = "sample"
 PRIMARY_KEY = f'{TARGET_TABLE}_id'
 
-NEW_TABLE_INFO = {
-    TARGET_TABLE: {
+# Read-only table info shared by every TestSetUpTDRTables test
+NEW_TABLE_INFO = MappingProxyType({
+    TARGET_TABLE: MappingProxyType({
         "table_name": TARGET_TABLE,
         "primary_key": PRIMARY_KEY,
         "ingest_metadata": [
@@ -23,279 +28,265 @@ NEW_TABLE_INFO = {
             }
         ],
         "datePartitionOptions": None
+    })
+})
+
+
+# Column schemas as inferred for NEW_TABLE_INFO, and for the columns of another existing table
+SAMPLE_ID_COLUMN = {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False}
+PARTICIPANT_ID_COLUMN = {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False}
+SEX_COLUMN = {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False}
+COLUMN_A = {'name': 'column_a', 'datatype': 'string', 'array_of': False, 'required': True}
+COLUMN_B = {'name': 'column_b', 'datatype': 'string', 'array_of': False, 'required': True}
+# Column in the ingest schema that is missing from the existing table
+PARTICIPANT_COLUMN = {'name': 'participant', 'required': True, 'datatype': 'string', 'array_of': False}
+
+
+def dataset_info_with_table(table_name, columns, primary_key):
+    """Dataset info, as returned by TDR with the schema included, for a dataset holding a single table."""
+    return {
+        'id': 'fake-dataset-id',
+        'name': 'fake-dataset-name',
+        'schema': {
+            'tables': [
+                {
+                    'name': table_name,
+                    'columns': columns,
+                    'primaryKey': primary_key,
+                    'partitionMode': 'none',
+                    'datePartitionOptions': None,
+                    'intPartitionOptions': None,
+                    'rowCount': None
+                }
+            ],
+            'relationships': [],
+            'assets': []
+        },
+    }
+
+
+# Dataset with one other table, before and after the "sample" table is created
+DATASET_BEFORE = dataset_info_with_table(
+    'some-fake-table',
+    [COLUMN_A, COLUMN_B],
+    ['column_a'],
+)
+DATASET_AFTER = dataset_info_with_table(
+    'some-fake-table',
+    [COLUMN_A, COLUMN_B, SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN],
+    ['column_a'],
+)
+# Dataset where the "sample" table already exists and matches the ingest metadata
+DATASET_SAMPLE_OK = dataset_info_with_table(
+    'sample',
+    [SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN],
+    ['sample_id'],
+)
+# Dataset where the "sample" table already exists but is missing the "sex" column
+DATASET_SAMPLE_MISSING_SEX = dataset_info_with_table(
+    'sample',
+    [SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN],
+    ['column_a'],
+)
+
+# Table created by SetUpTDRTables.run when "sample" does not exist yet
+EXPECTED_TABLES_TO_ADD = [
+    {
+        'name': 'sample',
+        'columns': [SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN],
+        'primaryKey': ['sample_id']
+    }
+]
+# Columns by table returned by SetUpTDRTables.run, after creating "sample" and when it already exists
+EXPECTED_KEYS_NEW_TABLE = {
+    'some-fake-table': {
+        'column_a': COLUMN_A,
+        'column_b': COLUMN_B,
+        'sample_id': SAMPLE_ID_COLUMN,
+        'participant_id': PARTICIPANT_ID_COLUMN,
+        'sex': SEX_COLUMN,
+    }
+}
+EXPECTED_KEYS_EXISTING = {
+    'sample': {
+        'sample_id': SAMPLE_ID_COLUMN,
+        'participant_id': PARTICIPANT_ID_COLUMN,
+        'sex': SEX_COLUMN,
     }
 }
 
 
+# Tables for the MatchSchemas tests
+TABLE_A = {
+    "name": "table_a",
+    "columns": [
+        {"name": "id", "datatype": "string", "mode": "required"},
+        {"name": "value", "datatype": "string", "mode": "nullable"}
+    ]
+}
+TABLE_B = {
+    "name": "table_b",
+    "columns": [
+        {"name": "id", "datatype": "string", "mode": "required"},
+        {"name": "count", "datatype": "integer", "mode": "nullable"}
+    ]
+}
+TABLE_C = {
+    "name": "table_c",
+    "columns": [
+        {"name": "id", "datatype": "string", "mode": "required"},
+        {"name": "description", "datatype": "string", "mode": "nullable"}
+    ]
+}
+# Original dataset, and a destination dataset that is missing table_b
+ORIG_DATASET_INFO = {"name": "original_dataset", "schema": {"tables": [TABLE_A, TABLE_B]}}
+DEST_DATASET_INFO = {"name": "destination_dataset", "schema": {"tables": [TABLE_A]}}
+
+
+class FakeResponse:
+    """Stand-in for a requests.Response with a fixed JSON body."""
+
+    def __init__(self, body):
+        self.status_code = 200
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeTDR:
+    """Stand-in for TDR that returns queued dataset info and records the calls made to it."""
+
+    def __init__(self):
+        # Bodies returned by get_dataset_info in order, the last one keeps being returned once the others are used
+        self.dataset_infos = []
+        self.get_dataset_info_calls = []
+        self.update_dataset_schema_calls = []
+
+    def get_dataset_info(self, **kwargs):
+        self.get_dataset_info_calls.append(kwargs)
+        if len(self.dataset_infos) > 1:
+            return FakeResponse(self.dataset_infos.pop(0))
+        return FakeResponse(self.dataset_infos[0])
+
+    def update_dataset_schema(self, **kwargs):
+        self.update_dataset_schema_calls.append(kwargs)
+
+
 class TestSetUpTDRTables(TestCase):
 
-    @patch("ops_utils.tdr_utils.tdr_api_utils.TDR")
-    def setUp(self, mock_tdr):
-        self.mock_tdr = mock_tdr
+    @classmethod
+    def setUpClass(cls):
+        # Patch sys.exit once for the class, run exits when an existing table does not match the ingest schema
+        cls.patcher_sys_exit = patch("ops_utils.tdr_utils.tdr_table_utils.sys.exit")
+        cls.mock_sys_exit = cls.patcher_sys_exit.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher_sys_exit.stop()
+
+    def setUp(self):
+        # Clear calls recorded by previous tests
+        self.mock_sys_exit.reset_mock()
 
-        # Mock the TDR instance
-        self.mock_tdr_instance = MagicMock()
-        self.mock_tdr_instance.return_value = self.mock_tdr
+        self.fake_tdr = FakeTDR()
 
         self.dataset_id = "fake_dataset_id"
         self.tdr_table_util = SetUpTDRTables(
-            tdr=self.mock_tdr_instance,
+            tdr=self.fake_tdr,
             dataset_id=self.dataset_id,
             table_info_dict=NEW_TABLE_INFO,
         )
 
     def test_run_new_table_nonexistent_in_dataset(self):
         """Tests the 'run' method when the new table to ingest DOES NOT already exist in the dataset"""
-        columns_before  = [
-            {'name': 'column_a', 'datatype': 'string', 'array_of': False, 'required': True},
-            {'name': 'column_b', 'datatype': 'string', 'array_of': False, 'required': True}
-        ]
-        columns_after = columns_before + [
-            {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-        ]
         # The "get_dataset_info" method is called twice
         # The return value of the first call is the dataset info before the new table is added
         # The return value of the second call is the dataset info after the new table is added
-        self.mock_tdr_instance.get_dataset_info.side_effect = [
-            MagicMock(
-                status_code=200,
-                json=MagicMock(
-                    return_value={
-                        'id': 'fake-dataset-id',
-                        'name': 'fake-dataset-name', 'schema': {
-                            'tables': [
-                                {
-                                    'name': 'some-fake-table',
-                                    'columns': columns_before,
-                                    'primaryKey': ['column_a'],
-                                    'partitionMode': 'none',
-                                    'datePartitionOptions': None,
-                                    'intPartitionOptions': None,
-                                    'rowCount': None
-                                }
-                            ],
-                            'relationships': [],
-                            'assets': []
-                        },
-                    }
-                )
-            ),
-            MagicMock(
-                status_code=200,
-                json=MagicMock(
-                    return_value={
-                        'id': 'fake-dataset-id',
-                        'name': 'fake-dataset-name',
-                        'schema': {
-                            'tables': [
-                                {
-                                    'name': 'some-fake-table',
-                                    'columns': columns_after,
-                                    'primaryKey': ['column_a'],
-                                    'partitionMode': 'none',
-                                    'datePartitionOptions': None,
-                                    'intPartitionOptions': None,
-                                    'rowCount': None
-                                }
-                            ],
-                            'relationships': [],
-                            'assets': []
-                        },
-                    }
-                )
-            ),
-        ]
+        self.fake_tdr.dataset_infos = [DATASET_BEFORE, DATASET_AFTER]
         # Run the method
         actual_table_names_and_keys = self.tdr_table_util.run()
         # Assertions
-        self.mock_tdr_instance.update_dataset_schema.assert_called_once_with(
-            dataset_id=self.dataset_id,
-            update_note=f"Creating tables in dataset {self.dataset_id}",
-            tables_to_add=[
+        self.assertEqual(
+            self.fake_tdr.update_dataset_schema_calls,
+            [
                 {
-                    'name': 'sample',
-                    'columns': [
-                        {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                        {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                        {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-                    ],
-                    'primaryKey': ['sample_id']
+                    'dataset_id': self.dataset_id,
+                    'update_note': f"Creating tables in dataset {self.dataset_id}",
+                    'tables_to_add': EXPECTED_TABLES_TO_ADD
                 }
             ]
         )
-        expected_table_names_and_keys = {
-            'some-fake-table': {
-                'column_a': {'name': 'column_a', 'datatype': 'string', 'array_of': False, 'required': True},
-                'column_b': {'name': 'column_b', 'datatype': 'string', 'array_of': False, 'required': True},
-                'sample_id': {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                'participant_id': {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                'sex': {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-            }
-        }
-        self.assertEqual(actual_table_names_and_keys, expected_table_names_and_keys)
+        self.assertEqual(actual_table_names_and_keys, EXPECTED_KEYS_NEW_TABLE)
         # Assert that get_dataset_info was called twice with the same parameters
-        self.mock_tdr_instance.get_dataset_info.assert_has_calls(
-            calls=[
-                call(dataset_id=self.dataset_id, info_to_include=['SCHEMA']),
-                call(dataset_id=self.dataset_id, info_to_include=['SCHEMA']),
+        self.assertEqual(
+            self.fake_tdr.get_dataset_info_calls,
+            [
+                {'dataset_id': self.dataset_id, 'info_to_include': ['SCHEMA']},
+                {'dataset_id': self.dataset_id, 'info_to_include': ['SCHEMA']},
             ]
         )
+        self.mock_sys_exit.assert_not_called()
 
     def test_run_new_table_exists_in_dataset(self):
         """Tests the 'run' method when the new table to ingest ALREADY EXISTS in the dataset AND
         does not need to be updated"""
 
-        columns = [
-            {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-        ]
-
-        self.mock_tdr_instance.get_dataset_info.return_value = MagicMock(
-            status_code=200,
-            json=MagicMock(
-                return_value={
-                    'id': 'fake-dataset-id',
-                    'name': 'fake-dataset-name',
-                    'schema': {
-                        'tables': [
-                            {
-                                'name': 'sample',
-                                'columns': columns,
-                                'primaryKey': ['sample_id'],
-                                'partitionMode': 'none',
-                                'datePartitionOptions': None,
-                                'intPartitionOptions': None,
-                                'rowCount': None
-                            }
-                        ],
-                        'relationships': [],
-                        'assets': []
-                    },
-                }
-            )
-        )
+        self.fake_tdr.dataset_infos = [DATASET_SAMPLE_OK]
         # Call the method
         actual_table_names_and_keys = self.tdr_table_util.run()
         # Assertions
-        expected_table_names_and_keys = {
-            'sample': {
-                'sample_id': {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                'participant_id': {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                'sex': {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-            }
-        }
-        self.mock_tdr_instance.update_dataset_schema.assert_not_called()
-        self.assertEqual(actual_table_names_and_keys, expected_table_names_and_keys)
-        # Assert that get_dataset_info was called twice with the same parameters
-        self.mock_tdr_instance.get_dataset_info.assert_has_calls(
-            calls=[
-                call(dataset_id=self.dataset_id, info_to_include=['SCHEMA']),
-                call().json(),
-                call(dataset_id=self.dataset_id, info_to_include=['SCHEMA']),
-                call().json(),
-            ]
+        self.assertEqual(self.fake_tdr.update_dataset_schema_calls, [])
+        self.assertEqual(actual_table_names_and_keys, EXPECTED_KEYS_EXISTING)
+        # Assert that get_dataset_info was only called once, since no tables were created
+        self.assertEqual(
+            self.fake_tdr.get_dataset_info_calls, [{'dataset_id': self.dataset_id, 'info_to_include': ['SCHEMA']}]
         )
+        self.mock_sys_exit.assert_not_called()
 
-    @patch("ops_utils.tdr_utils.tdr_table_utils.sys.exit")
-    def test_run_new_table_exists_in_dataset_needs_updating(self, mock_sys_exit):
+    def test_run_new_table_exists_in_dataset_needs_updating(self):
         """Tests the 'run' method when the new table to ingest ALREADY EXISTS in the dataset AND
         NEEDS to be updated"""
 
-        self.mock_tdr_instance.get_dataset_info.return_value = MagicMock(
-            status_code=200,
-            json=MagicMock(
-                return_value={
-                    'id': 'fake-dataset-id',
-                    'name': 'fake-dataset-name',
-                    'schema': {
-                        'tables': [
-                            {
-                                'name': 'sample',
-                                'columns': [
-                                    # Missing the "sex" column from the EXISTING dataset
-                                    {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                                    {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                                ],
-                                'primaryKey': ['column_a'],
-                                'partitionMode': 'none',
-                                'datePartitionOptions': None,
-                                'intPartitionOptions': None,
-                                'rowCount': None
-                            }
-                        ],
-                        'relationships': [],
-                        'assets': []
-                    },
-                }
-            )
-        )
+        self.fake_tdr.dataset_infos = [DATASET_SAMPLE_MISSING_SEX]
 
         # Run the method
         self.tdr_table_util.run()
 
         # Assertions
-        self.mock_tdr_instance.get_dataset_info.assert_any_call(
-            dataset_id=self.dataset_id, info_to_include=["SCHEMA"]
+        self.assertIn(
+            {'dataset_id': self.dataset_id, 'info_to_include': ['SCHEMA']}, self.fake_tdr.get_dataset_info_calls
         )
+        self.assertEqual(self.fake_tdr.update_dataset_schema_calls, [])
 
         # Assert sys.exit(1) was called due to schema mismatch and no ignore flag
-        mock_sys_exit.assert_called_once_with(1)
-
-    def test_compare_table_matching_schemas(self):
-        expected_schema = {
-            'name': 'sample',
-            'columns': [
-                {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False}
-            ]
-        }
-
-        existing_schema = [
-            {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False}
-        ]
-
-        # Call the method
-        columns_to_update = self.tdr_table_util._compare_table(
-            reference_dataset_table=expected_schema,
-            target_dataset_table=existing_schema,
-            table_name="sample"
-        )
-        # Assertions
-        self.assertEqual(columns_to_update, [])
-
-    def test_compare_table_mis_matched_schemas(self):
-        expected_schema = {
-            'name': 'sample',
-            'columns': [
-                {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-                {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False},
-                {'name': 'participant', 'required': True, 'datatype': 'string', 'array_of': False}
-            ]
-        }
-
-        existing_schema = [
-            {'name': 'sample_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'participant_id', 'required': True, 'datatype': 'string', 'array_of': False},
-            {'name': 'sex', 'required': True, 'datatype': 'string', 'array_of': False}
-        ]
-
-        # Call the method
-        columns_to_update = self.tdr_table_util._compare_table(
-            reference_dataset_table=expected_schema,
-            target_dataset_table=existing_schema,
-            table_name="sample"
-        )
-        # Assertions
-        self.assertEqual(
-            columns_to_update, [{'name': 'participant', 'required': True, 'datatype': 'string', 'array_of': False, "action": "add"}]
-        )
+        self.mock_sys_exit.assert_called_once_with(1)
+
+
+@pytest.mark.parametrize(
+    "reference_columns,expected_columns_to_update",
+    [
+        pytest.param([SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN], [], id="matching_schemas"),
+        pytest.param(
+            [SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN, PARTICIPANT_COLUMN],
+            [{**PARTICIPANT_COLUMN, "action": "add"}],
+            id="mis_matched_schemas",
+        ),
+    ],
+)
+def test_compare_table(reference_columns, expected_columns_to_update):
+    # _compare_table adds an "action" to the reference columns that need updating, so pass it copies
+    expected_schema = {'name': 'sample', 'columns': copy.deepcopy(reference_columns)}
+    existing_schema = [SAMPLE_ID_COLUMN, PARTICIPANT_ID_COLUMN, SEX_COLUMN]
+
+    # Call the method, it is a staticmethod so no SetUpTDRTables instance is needed
+    columns_to_update = SetUpTDRTables._compare_table(
+        reference_dataset_table=expected_schema,
+        target_dataset_table=existing_schema,
+        table_name="sample"
+    )
+    # Assertions
+    assert columns_to_update == expected_columns_to_update
 
 
 class TestMatchSchemas(TestCase):
@@ -303,46 +294,11 @@ class TestMatchSchemas(TestCase):
 
     def setUp(self):
         # Create mock TDR instance
-        self.mock_tdr = MagicMock()
-
-        # Define test data for original dataset
-        self.orig_dataset_info = {
-            "name": "original_dataset",
-            "schema": {
-                "tables": [
-                    {
-                        "name": "table_a",
-                        "columns": [
-                            {"name": "id", "datatype": "string", "mode": "required"},
-                            {"name": "value", "datatype": "string", "mode": "nullable"}
-                        ]
-                    },
-                    {
-                        "name": "table_b",
-                        "columns": [
-                            {"name": "id", "datatype": "string", "mode": "required"},
-                            {"name": "count", "datatype": "integer", "mode": "nullable"}
-                        ]
-                    }
-                ]
-            }
-        }
+        self.mock_tdr = MagicMock(spec=TDR)
 
-        # Define test data for destination dataset
-        self.dest_dataset_info = {
-            "name": "destination_dataset",
-            "schema": {
-                "tables": [
-                    {
-                        "name": "table_a",
-                        "columns": [
-                            {"name": "id", "datatype": "string", "mode": "required"},
-                            {"name": "value", "datatype": "string", "mode": "nullable"}
-                        ]
-                    }
-                ]
-            }
-        }
+        # Copy the dataset info, since tests add tables to it
+        self.orig_dataset_info = copy.deepcopy(ORIG_DATASET_INFO)
+        self.dest_dataset_info = copy.deepcopy(DEST_DATASET_INFO)
 
         self.dest_dataset_id = "dest-dataset-123"
 
@@ -387,24 +343,7 @@ class TestMatchSchemas(TestCase):
         # Modify destination dataset to include all tables from the original dataset
         self.dest_dataset_info = {
             "name": "destination_dataset",
-            "schema": {
-                "tables": [
-                    {
-                        "name": "table_a",
-                        "columns": [
-                            {"name": "id", "datatype": "string", "mode": "required"},
-                            {"name": "value", "datatype": "string", "mode": "nullable"}
-                        ]
-                    },
-                    {
-                        "name": "table_b",
-                        "columns": [
-                            {"name": "id", "datatype": "string", "mode": "required"},
-                            {"name": "count", "datatype": "integer", "mode": "nullable"}
-                        ]
-                    }
-                ]
-            }
+            "schema": {"tables": copy.deepcopy([TABLE_A, TABLE_B])}
         }
 
         # Create a new MatchSchemas instance with the updated destination dataset
@@ -424,13 +363,7 @@ class TestMatchSchemas(TestCase):
     def test_run_multiple_missing_tables(self):
         """Test that the run method adds multiple missing tables"""
         # Add another table to the original dataset
-        self.orig_dataset_info["schema"]["tables"].append({
-            "name": "table_c",
-            "columns": [
-                {"name": "id", "datatype": "string", "mode": "required"},
-                {"name": "description", "datatype": "string", "mode": "nullable"}
-            ]
-        })
+        self.orig_dataset_info["schema"]["tables"].append(copy.deepcopy(TABLE_C))
 
         # Run the matching process
         self.match_schemas.run()
@@ -441,8 +374,6 @@ class TestMatchSchemas(TestCase):
         # Get the arguments from the call
         args, kwargs = self.mock_tdr.update_dataset_schema.call_args
 
-        # Check that the tables_to_add contains both missing tables
+        # Check that the tables_to_add contains both missing tables, and only those
         self.assertEqual(len(kwargs['tables_to_add']), 2)
-        table_names = [table['name'] for table in kwargs['tables_to_add']]
-        self.assertIn('table_b', table_names)
-        self.assertIn('table_c', table_names)
+        self.assertEqual({table['name'] for table in kwargs['tables_to_add']}, {'table_b', 'table_c'})
@@ -1,213 +1,242 @@
+import json
 import re
 import pytest
 import unittest
-import responses
-from unittest.mock import MagicMock, mock_open, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec, mock_open, patch
 
+from helpers import add_responses_from_file, preload_responses_files
 from ops_utils.request_util import RunRequest
 from ops_utils.terra_util import TerraWorkspace, Terra, TerraGroups, RAWLS_LINK, SAM_LINK
 
-mock_token = MagicMock()
-request_util = RunRequest(token=mock_token)
+# Contents of the metadata TSV uploaded to the workspace sample table
+SAMPLE_METADATA_TSV = "entity:sample_id\tsample_alias\nRP-123_ABC\tABC"
 
+# URLs the Terra and TerraGroups tests expect requests to be made to
+ACCESSIBLE_WORKSPACES_URL = f"{RAWLS_LINK}/workspaces?"
+PET_ACCOUNT_KEY_URL = f"{SAM_LINK}/google/v1/user/petServiceAccount/key"
+GROUP_URL = f"{SAM_LINK}/groups/v1/fake-group"
+GROUP_MEMBER_URL = f"{GROUP_URL}/member/fake-email@fake.com"
+# Error raised by TerraGroups for a role other than member or admin
+INVALID_ROLE_ERROR = re.compile(re.escape("Role must be one of ['member', 'admin']"))
 
-class TestTerraWorkspaceUtils:
-    workspace = TerraWorkspace(
+# Entity query pages, as parsed from the text of the entityQuery responses
+SINGLE_ENTITY_PAGE = {"results": [{"id": "entity1"}, {"id": "entity2"}], "resultMetadata": {"filteredPageCount": 1}}
+ENTITY_PAGES = (
+    {"results": [{"id": "entity1"}], "resultMetadata": {"filteredPageCount": 2}},
+    {"results": [{"id": "entity2"}], "resultMetadata": {"filteredPageCount": 2}},
+)
+
+
+def fake_response(payload=None, text="", status_code=200):
+    """Stand-in for a requests.Response with a fixed JSON payload and text."""
+    return SimpleNamespace(status_code=status_code, text=text, json=lambda: payload)
+
+
+@pytest.fixture(scope="module")
+def workspace(request_util):
+    return TerraWorkspace(
         workspace_name="test_workspace",
         billing_project="test_billing_project",
         request_util=request_util
     )
 
-    @responses.activate
-    def test_get_workspace(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/get_workspace.yaml")
-        workspace_info = self.workspace.get_workspace_info().json()
+
+class TestTerraWorkspaceUtils:
+
+    @classmethod
+    def setup_class(cls):
+        # Parse all the recorded responses once. Each test still registers only its own file
+        preload_responses_files("ops_utils/tests/data/terra_util")
+
+    def test_get_workspace(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/get_workspace.yaml", mocked_responses)
+        workspace_info = workspace.get_workspace_info().json()
         assert workspace_info
 
-    @responses.activate
-    def test_get_workspace_bucket(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/get_workspace.yaml")
-        workspace_bucket = self.workspace.get_workspace_bucket()
+    def test_get_workspace_bucket(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/get_workspace.yaml", mocked_responses)
+        workspace_bucket = workspace.get_workspace_bucket()
         assert workspace_bucket == "gs-bucket-id"
 
-    @responses.activate
-    def test_get_workspace_entity_info(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/workspace_entity_info.yaml")
-        entify_info = self.workspace.get_workspace_entity_info().json()
+    def test_get_workspace_entity_info(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/workspace_entity_info.yaml", mocked_responses)
+        entify_info = workspace.get_workspace_entity_info().json()
         assert entify_info['file_metadata']['idName'] == "file_metadata_id"
 
-    @responses.activate
-    def test_get_workspace_acl(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/workspace_acl_info.yaml")
-        workspace_acl = self.workspace.get_workspace_acl().json()
+    def test_get_workspace_acl(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/workspace_acl_info.yaml", mocked_responses)
+        workspace_acl = workspace.get_workspace_acl().json()
         assert workspace_acl
 
-    @responses.activate
-    def test_get_workspace_metrics(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/workspace_metrics.yaml")
-        workspace_metrics = self.workspace.get_gcp_workspace_metrics(entity_type='file_metadata')
+    def test_get_workspace_metrics(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/workspace_metrics.yaml", mocked_responses)
+        workspace_metrics = workspace.get_gcp_workspace_metrics(entity_type='file_metadata')
         assert workspace_metrics
 
-    @responses.activate
-    def test_get_workspace_workflows(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/get_workspace_workflows.yaml")
-        workflows = self.workspace.get_workspace_workflows().json()
+    def test_get_workspace_workflows(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/get_workspace_workflows.yaml", mocked_responses)
+        workflows = workspace.get_workspace_workflows().json()
         assert workflows
 
-    @responses.activate
-    def test_check_workspace_public(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/check_workspace_public.yaml")
-        workspace_public = self.workspace.check_workspace_public().json()
+    def test_check_workspace_public(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/check_workspace_public.yaml", mocked_responses)
+        workspace_public = workspace.check_workspace_public().json()
         assert not workspace_public
 
-    @responses.activate
-    def test_create_workspace(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/create_workspace.yaml")
-        new_workspace_metadata = self.workspace.create_workspace().json()
+    def test_create_workspace(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/create_workspace.yaml", mocked_responses)
+        new_workspace_metadata = workspace.create_workspace().json()
         assert new_workspace_metadata
 
-    @responses.activate
-    def test_update_workspace_attributes(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/update_workspace_attributes.yaml")
+    def test_update_workspace_attributes(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/update_workspace_attributes.yaml", mocked_responses)
         attributes = [{"op": "AddUpdateAttribute", "attributeName": "dataset_id", "addUpdateAttribute": 'ex-dataset-guid'}]
-        workspace_update = self.workspace.update_workspace_attributes(attributes=attributes).json()
+        workspace_update = workspace.update_workspace_attributes(attributes=attributes).json()
         assert workspace_update
 
-    @responses.activate
-    def test_update_user_acl(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/update_acl.yaml")
-        update_acl = self.workspace.update_user_acl(
+    def test_update_user_acl(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/update_acl.yaml", mocked_responses)
+        update_acl = workspace.update_user_acl(
             email='test-account@integration-project.iam.gserviceaccount.com', access_level='READER').json()
         assert update_acl
 
-    @responses.activate
-    def test_update_multiple_user_acl(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/update_multiple_acl.yaml")
+    def test_update_multiple_user_acl(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/update_multiple_acl.yaml", mocked_responses)
         acl_list = [{"email": "test@broadinstitute.org", "accessLevel": "READER", "canShare": False, "canCompute": False, },
                     {"email": "test-account@integration-project.iam.gserviceaccount.com", "accessLevel": "READER", "canShare": False, "canCompute": False, }]
-        update_multiple_acl = self.workspace.update_multiple_users_acl(acl_list=acl_list, invite_users_not_found=False).json()
+        update_multiple_acl = workspace.update_multiple_users_acl(acl_list=acl_list, invite_users_not_found=False).json()
         assert update_multiple_acl
 
-    @responses.activate
-    def test_upload_metadata_metadata(self):
-        responses._add_from_file(file_path="ops_utils/tests/data/terra_util/put_library_metadata.yaml")
-        with patch('ops_utils.terra_util.open', mock_open(read_data="entity:sample_id\tsample_alias\nRP-123_ABC\tABC")):
-            upload_metadata_res = self.workspace.upload_metadata_to_workspace_table("sample.tsv")
+    def test_upload_metadata_metadata(self, workspace, mocked_responses):
+        add_responses_from_file("ops_utils/tests/data/terra_util/put_library_metadata.yaml", mocked_responses)
+        with patch('ops_utils.terra_util.open', mock_open(read_data=SAMPLE_METADATA_TSV)):
+            upload_metadata_res = workspace.upload_metadata_to_workspace_table("sample.tsv")
         assert upload_metadata_res
 
 
-class TestTerra(unittest.TestCase):
+@pytest.fixture(scope="module")
+def _module_request_mock():
+    """One autospecced RunRequest for the rest of the module.
 
-    @patch("ops_utils.terra_util.RunRequest")
-    def setUp(self, mock_request_util):
-        self.mock_request_util = mock_request_util
+    Built once, since autospec inspects every method signature. Calls that do not match the signature
+    of the real RunRequest method fail the test.
+    """
+    return create_autospec(RunRequest, instance=True)
 
-        # Mock the RunRequest instance
-        self.mock_request_instance = MagicMock()
-        self.mock_request_instance.return_value = self.mock_request_util
 
-        # Instantiate the Terra class with the mocked request_util
-        self.terra = Terra(request_util=self.mock_request_instance)
+@pytest.fixture
+def mock_request_instance(_module_request_mock):
+    """The module's mocked RunRequest, with the calls and return values set by previous tests cleared."""
+    _module_request_mock.reset_mock(return_value=True, side_effect=True)
+    return _module_request_mock
 
-    def test_fetch_accessible_workspaces(self):
-        # Run the method
-        self.terra.fetch_accessible_workspaces(fields=None)
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{RAWLS_LINK}/workspaces?",
-            method="GET"
-        )
+@pytest.fixture(scope="module")
+def terra(_module_request_mock):
+    # Terra holds no state other than its request_util, so it is built once per module
+    return Terra(request_util=_module_request_mock)
 
-    def test_get_pet_account_json(self):
-        # Run the method
-        self.terra.get_pet_account_json()
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/google/v1/user/petServiceAccount/key",
-            method="GET"
-        )
+@pytest.fixture(scope="module")
+def terra_groups(_module_request_mock):
+    # TerraGroups holds no state other than its request_util, so it is built once per module
+    return TerraGroups(request_util=_module_request_mock)
 
 
-class TestTerraGroups(unittest.TestCase):
+def test_fetch_accessible_workspaces(terra, mock_request_instance):
+    # Run the method
+    terra.fetch_accessible_workspaces(fields=None)
 
-    @patch("ops_utils.terra_util.RunRequest")
-    def setUp(self, mock_request_util):
-        self.mock_request_util = mock_request_util
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=ACCESSIBLE_WORKSPACES_URL,
+        method="GET"
+    )
 
-        # Mock the RunRequest instance
-        self.mock_request_instance = MagicMock()
-        self.mock_request_instance.return_value = self.mock_request_util
 
-        # Instantiate the TerraGroups class with the mocked request_util
-        self.terra_groups = TerraGroups(request_util=self.mock_request_instance)
+def test_get_pet_account_json(terra, mock_request_instance):
+    # Run the method
+    terra.get_pet_account_json()
 
-    def test_check_role_accepted_role(self):
-        res = self.terra_groups._check_role("member")
-        self.assertIsNone(res)
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=PET_ACCOUNT_KEY_URL,
+        method="GET"
+    )
 
-    def test_check_role_non_accepted_role(self):
-        with pytest.raises(ValueError, match=re.escape("Role must be one of ['member', 'admin']")):
-            self.terra_groups._check_role("invalid_role")
 
-    def test_remove_user_from_group(self):
-        self.terra_groups.remove_user_from_group(group="fake-group", email="fake-email@fake.com", role="member")
+def test_check_role_accepted_role(terra_groups):
+    assert terra_groups._check_role("member") is None
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group/member/fake-email@fake.com",
-            method="DELETE",
-        )
 
-    def test_create_group(self):
-        self.terra_groups.create_group(group_name="fake-group", continue_if_exists=False)
+def test_check_role_non_accepted_role(terra_groups):
+    with pytest.raises(ValueError, match=INVALID_ROLE_ERROR):
+        terra_groups._check_role("invalid_role")
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group",
-            method="POST",
-            accept_return_codes=[]
-        )
 
-    def test_create_group_already_exists(self):
-        self.terra_groups.create_group(group_name="fake-group", continue_if_exists=True)
+def test_remove_user_from_group(terra_groups, mock_request_instance):
+    terra_groups.remove_user_from_group(group="fake-group", email="fake-email@fake.com", role="member")
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group",
-            method="POST",
-            accept_return_codes=[409]
-        )
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_MEMBER_URL,
+        method="DELETE",
+    )
 
-    def test_delete_group(self):
-        self.terra_groups.delete_group(group_name="fake-group")
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group",
-            method="DELETE",
-        )
+def test_create_group(terra_groups, mock_request_instance):
+    terra_groups.create_group(group_name="fake-group", continue_if_exists=False)
 
-    def test_add_user_to_group(self):
-        self.terra_groups.add_user_to_group(
-            group="fake-group", email="fake-email@fake.com", role="member", continue_if_exists=False
-        )
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_URL,
+        method="POST",
+        accept_return_codes=[]
+    )
 
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group/member/fake-email@fake.com",
-            method="PUT",
-            accept_return_codes=[]
-        )
 
-    def test_add_user_to_group_already_exists(self):
-        self.terra_groups.add_user_to_group(
-            group="fake-group", email="fake-email@fake.com", role="member", continue_if_exists=True
-        )
-        self.mock_request_instance.run_request.assert_called_once_with(
-            uri=f"{SAM_LINK}/groups/v1/fake-group/member/fake-email@fake.com",
-            method="PUT",
-            accept_return_codes=[409]
-        )
+def test_create_group_already_exists(terra_groups, mock_request_instance):
+    terra_groups.create_group(group_name="fake-group", continue_if_exists=True)
+
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_URL,
+        method="POST",
+        accept_return_codes=[409]
+    )
+
+
+def test_delete_group(terra_groups, mock_request_instance):
+    terra_groups.delete_group(group_name="fake-group")
+
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_URL,
+        method="DELETE",
+    )
+
+
+def test_add_user_to_group(terra_groups, mock_request_instance):
+    terra_groups.add_user_to_group(
+        group="fake-group", email="fake-email@fake.com", role="member", continue_if_exists=False
+    )
+
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_MEMBER_URL,
+        method="PUT",
+        accept_return_codes=[]
+    )
+
+
+def test_add_user_to_group_already_exists(terra_groups, mock_request_instance):
+    terra_groups.add_user_to_group(
+        group="fake-group", email="fake-email@fake.com", role="member", continue_if_exists=True
+    )
+    mock_request_instance.run_request.assert_called_once_with(
+        uri=GROUP_MEMBER_URL,
+        method="PUT",
+        accept_return_codes=[409]
+    )
 
 
 class TestTerraWorkspaceMethods(unittest.TestCase):
     def setUp(self):
-        self.mock_request_instance = MagicMock()
+        self.mock_request_instance = MagicMock(spec=RunRequest)
         self.workspace = TerraWorkspace(
             workspace_name="test_workspace",
             billing_project="test_billing_project",
@@ -245,20 +274,9 @@ class TestTerraWorkspaceMethods(unittest.TestCase):
             method="GET"
         )
 
-    @patch('json.loads')
-    def test_yield_all_entity_metrics_single_page(self, mock_json_loads):
-        # Mock response for first page
-        mock_response = MagicMock()
-        mock_response.text = '{"results": [{"id": "entity1"}, {"id": "entity2"}], "resultMetadata": {"filteredPageCount": 1}}'
-
-        # Mock json.loads to return formatted data
-        mock_json_loads.return_value = {
-            "results": [{"id": "entity1"}, {"id": "entity2"}],
-            "resultMetadata": {"filteredPageCount": 1}
-        }
-
-        # Mock the run_request method to return our mock response
-        self.mock_request_instance.run_request.return_value = mock_response
+    def test_yield_all_entity_metrics_single_page(self):
+        # Mock the run_request method to return the only page
+        self.mock_request_instance.run_request.return_value = fake_response(text=json.dumps(SINGLE_ENTITY_PAGE))
 
         # Call the method and collect results
         results = list(self.workspace._yield_all_entity_metrics("sample"))
@@ -267,31 +285,12 @@ class TestTerraWorkspaceMethods(unittest.TestCase):
         self.mock_request_instance.run_request.assert_called_once()
 
         # Assert that we got expected results
-        self.assertEqual(len(results), 1)
-        self.assertEqual(results[0]["results"], [{"id": "entity1"}, {"id": "entity2"}])
-
-    @patch('json.loads')
-    def test_yield_all_entity_metrics_multiple_pages(self, mock_json_loads):
-        # Mock responses for first and second pages
-        first_response = MagicMock()
-        first_response.text = '{"results": [{"id": "entity1"}], "resultMetadata": {"filteredPageCount": 2}}'
-
-        second_response = MagicMock()
-        second_response.text = '{"results": [{"id": "entity2"}], "resultMetadata": {"filteredPageCount": 2}}'
+        self.assertEqual(results, [SINGLE_ENTITY_PAGE])
 
-        # Set up side effects for run_request to return different responses
-        self.mock_request_instance.run_request.side_effect = [first_response, second_response]
-
-        # Set up side effects for json.loads to return different parsed data
-        mock_json_loads.side_effect = [
-            {
-                "results": [{"id": "entity1"}],
-                "resultMetadata": {"filteredPageCount": 2}
-            },
-            {
-                "results": [{"id": "entity2"}],
-                "resultMetadata": {"filteredPageCount": 2}
-            }
+    def test_yield_all_entity_metrics_multiple_pages(self):
+        # Set up side effects for run_request to return the first and second pages
+        self.mock_request_instance.run_request.side_effect = [
+            fake_response(text=json.dumps(page)) for page in ENTITY_PAGES
         ]
 
         # Call the method and collect results
@@ -301,6 +300,48 @@ class TestTerraWorkspaceMethods(unittest.TestCase):
         self.assertEqual(self.mock_request_instance.run_request.call_count, 2)
 
         # Assert that we got expected results from both pages
-        self.assertEqual(len(results), 2)
-        self.assertEqual(results[0]["results"], [{"id": "entity1"}])
-        self.assertEqual(results[1]["results"], [{"id": "entity2"}])
+        self.assertEqual(results, list(ENTITY_PAGES))
+
+    def test_get_workspace_submission_stats_skips_submissions_without_active_workflows(self):
+        submissions_response = fake_response([
+            {
+                "submissionId": "sub-failed",
+                "methodConfigurationName": "method",
+                "status": "Aborting",
+                "workflowStatuses": {"Failed": 2}
+            },
+            {
+                "submissionId": "sub-running",
+                "methodConfigurationName": "method",
+                "status": "Submitted",
+                "workflowStatuses": {"Running": 1, "Succeeded": 1}
+            }
+        ])
+        submission_details_response = fake_response({
+            "workflows": [
+                {"status": "Running", "workflowEntity": {"entityName": "sample1"}},
+                {"status": "Succeeded", "workflowEntity": {"entityName": "sample2"}}
+            ]
+        })
+        self.mock_request_instance.run_request.side_effect = [submissions_response, submission_details_response]
+
+        stats = self.workspace.get_workspace_submission_stats()
+
+        # Only the workspace submissions call and the single running submission's details call are made
+        self.assertEqual(self.mock_request_instance.run_request.call_count, 2)
+        self.assertEqual(stats["id_still_running"], ["sample1"])
+        self.assertEqual(stats["failed"], 2)
+        self.assertEqual(stats["running"], 1)
+
+    @patch("ops_utils.terra_util.GCPCloudFunctions")
+    def test_get_gcp_util_and_active_account_are_reused(self, mock_gcp_cloud_functions):
+        mock_gcp_cloud_functions.return_value.get_active_gcloud_account.return_value = "user@example.com"
+
+        first_util = self.workspace._get_gcp_util(project="test-project")
+        second_util = self.workspace._get_gcp_util(project="test-project")
+        self.assertIs(first_util, second_util)
+        mock_gcp_cloud_functions.assert_called_once_with(project="test-project")
+
+        self.assertEqual(self.workspace._get_active_gcloud_account(first_util), "user@example.com")
+        self.assertEqual(self.workspace._get_active_gcloud_account(first_util), "user@example.com")
+        first_util.get_active_gcloud_account.assert_called_once()
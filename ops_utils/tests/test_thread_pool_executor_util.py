@@ -1,5 +1,4 @@
 from unittest import TestCase
-from unittest.mock import MagicMock
 
 from ops_utils.thread_pool_executor_util import MultiThreadedJobs
 
@@ -13,34 +12,51 @@ def always_fails(*args, **kwargs):
     raise ValueError("Permanent failure")
 
 
+class FakeJobFunction:
+    """Stand-in for a job function that records its calls and returns or raises the given outcomes in order.
+
+    The last outcome keeps being used once the others are used.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
 class TestMultiThreadedJobs(TestCase):
     def setUp(self):
         self.multithreaded = MultiThreadedJobs()
 
     def test_function_succeeds_first_try(self):
-        mock_func = MagicMock(return_value="success")
-        status, result = self.multithreaded.execute_with_retries(mock_func, job_args_list=["arg1"], max_retries=3)
+        fake_func = FakeJobFunction("success")
+        status, result = self.multithreaded.execute_with_retries(fake_func, job_args_list=["arg1"], max_retries=3)
 
         self.assertTrue(status)
         self.assertEqual(result, "success")
-        mock_func.assert_called_once_with("arg1")
+        self.assertEqual(fake_func.calls, [("arg1",)])
 
     def test_function_fails_then_succeeds(self):
-        mock_func = MagicMock()
-        mock_func.side_effect = [Exception("fail 1"), "success"]
-        status, result = self.multithreaded.execute_with_retries(mock_func, job_args_list=[], max_retries=3)
+        fake_func = FakeJobFunction(Exception("fail 1"), "success")
+        status, result = self.multithreaded.execute_with_retries(fake_func, job_args_list=[], max_retries=3)
 
         self.assertTrue(status)
         self.assertEqual(result, "success")
-        self.assertEqual(mock_func.call_count, 2)
+        self.assertEqual(len(fake_func.calls), 2)
 
     def test_function_fails_all_retries(self):
-        mock_func = MagicMock(side_effect=Exception("fail"))
-        status, result = self.multithreaded.execute_with_retries(mock_func, job_args_list=[], max_retries=3)
+        fake_func = FakeJobFunction(Exception("fail"))
+        status, result = self.multithreaded.execute_with_retries(fake_func, job_args_list=[], max_retries=3)
 
         self.assertFalse(status)
         self.assertIsNone(result)
-        self.assertEqual(mock_func.call_count, 3)
+        self.assertEqual(len(fake_func.calls), 3)
 
 
     def test_run_multi_threaded_job_collect_output_success(self):
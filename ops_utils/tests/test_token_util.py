@@ -1,18 +1,31 @@
 import unittest
 import os
-from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta
+from unittest.mock import call, patch, MagicMock
 
-from ops_utils.token_util import Token
+import pytz
+
+from ops_utils.token_util import Token, _METADATA_SESSION
 
 
 class TestToken(unittest.TestCase):
     """Test the Token class with a mocked GCP token"""
 
-    @patch("oauth2client.client.GoogleCredentials.get_application_default")
-    def setUp(self, mock_get_application_default):
-        self.mock_get_application_default = mock_get_application_default
+    @classmethod
+    def setUpClass(cls):
+        # Patch application default credentials once for the class, they are built when the first GCP token is refreshed
+        cls.patcher_application_default = patch("oauth2client.client.GoogleCredentials.get_application_default")
+        cls.mock_get_application_default = cls.patcher_application_default.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patcher_application_default.stop()
 
-        # Mock the original GoogleCredentials instance
+    def setUp(self):
+        # Clear calls recorded by previous tests
+        self.mock_get_application_default.reset_mock()
+
+        # Mock the original GoogleCredentials instance, fresh for each test since tests configure it
         self.mock_google_credentials_instance = MagicMock()
         self.mock_get_application_default.return_value = self.mock_google_credentials_instance
 
@@ -23,11 +36,22 @@ class TestToken(unittest.TestCase):
         # Set refresh, token, expiry on the *scoped credentials*
         self.mock_scoped_credentials.refresh = MagicMock()
 
+        # Start every test without the tokens other tests shared across the process
+        token_cache_patcher = patch.dict("ops_utils.token_util._TOKEN_CACHE", clear=True)
+        token_cache_patcher.start()
+        self.addCleanup(token_cache_patcher.stop)
+
         # Instantiate the Token class
         self.gcp_token = Token(token_file=None)
 
     def test_init_gcp(self):
-        """Test the init method using GCP token"""
+        """Test the init method using GCP token, the credentials are only built once they are needed"""
+        self.mock_get_application_default.assert_not_called()
+
+        # Build the credentials twice
+        self.gcp_token._ensure_credentials()
+        self.gcp_token._ensure_credentials()
+
         self.mock_get_application_default.assert_called_once()
 
         self.mock_google_credentials_instance.create_scoped.assert_called_once_with(
@@ -50,6 +74,22 @@ class TestToken(unittest.TestCase):
 
         self.assertEqual(token, "fake-token")
 
+    @patch("ops_utils.token_util.httplib2.Http")
+    def test_get_gcp_token_reuses_http_client(self, mock_http):
+        # Have every refreshed token already be expired, so each call refreshes again
+        self.mock_scoped_credentials.get_access_token.return_value.access_token = "fake-token"
+        self.mock_scoped_credentials.token_expiry = datetime(2000, 1, 1)
+
+        # Call the method twice
+        self.gcp_token._get_gcp_token()
+        self.gcp_token._get_gcp_token()
+
+        # Assertions
+        mock_http.assert_called_once_with()
+        self.assertEqual(
+            self.mock_scoped_credentials.refresh.call_args_list, [call(mock_http.return_value)] * 2
+        )
+
     @patch("ops_utils.token_util.Token._get_gcp_token")
     def test_get_token_gcp(self, mock_get_gcp_token):
         mock_get_gcp_token.return_value = "fake-token"
@@ -61,12 +101,12 @@ class TestToken(unittest.TestCase):
         self.assertEqual(token, "fake-token")
         mock_get_gcp_token.assert_called_once()
 
-    @patch("ops_utils.token_util.requests.get")
-    def test_get_sa_token(self, mock_requests_get):
+    @patch("ops_utils.token_util._METADATA_SESSION.get")
+    def test_get_sa_token(self, mock_metadata_get):
         fake_response = MagicMock()
         fake_token = "fake-sa-token"
-        fake_response.json.return_value = {"access_token": fake_token}
-        mock_requests_get.return_value = fake_response
+        fake_response.json.return_value = {"access_token": fake_token, "expires_in": 3599, "token_type": "Bearer"}
+        mock_metadata_get.return_value = fake_response
 
         # Call the method
         res = self.gcp_token._get_sa_token()
@@ -76,16 +116,65 @@ class TestToken(unittest.TestCase):
         url = f"http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token?scopes={','.join(SCOPES)}"  # noqa: E501
 
         self.assertEqual(res, fake_token)
-        mock_requests_get.assert_called_once_with(url, headers={'Metadata-Flavor': 'Google'})
+        mock_metadata_get.assert_called_once_with(url, timeout=10)
+        self.assertEqual(_METADATA_SESSION.headers['Metadata-Flavor'], 'Google')
         self.assertEqual(self.gcp_token.token_string, fake_token)
 
+    @patch("ops_utils.token_util._METADATA_SESSION.get")
+    def test_get_sa_token_reuses_unexpired_token(self, mock_metadata_get):
+        fake_response = MagicMock()
+        fake_response.json.return_value = {"access_token": "fake-sa-token", "expires_in": 3599, "token_type": "Bearer"}
+        mock_metadata_get.return_value = fake_response
+
+        # Call the method twice, the second call is well within the token's expiry
+        first_token = self.gcp_token._get_sa_token()
+        second_token = self.gcp_token._get_sa_token()
+
+        # Assertions
+        self.assertEqual(first_token, "fake-sa-token")
+        self.assertEqual(second_token, "fake-sa-token")
+        mock_metadata_get.assert_called_once()
+        fake_response.json.assert_called_once()
+
+    @patch("ops_utils.token_util._METADATA_SESSION.get")
+    def test_get_sa_token_without_expires_in(self, mock_metadata_get):
+        fake_response = MagicMock()
+        fake_response.json.return_value = {"access_token": "fake-sa-token", "token_type": "Bearer"}
+        mock_metadata_get.return_value = fake_response
+
+        # Call the method, the response does not say how long the token is valid for
+        before = datetime.now(pytz.UTC)
+        res = self.gcp_token._get_sa_token()
+
+        # Assert the token is kept for the default hour
+        self.assertEqual(res, "fake-sa-token")
+        self.assertGreaterEqual(self.gcp_token.expiry, before + timedelta(seconds=3600))
+        self.assertLessEqual(self.gcp_token.expiry, datetime.now(pytz.UTC) + timedelta(seconds=3600))
+
+    @patch("ops_utils.token_util._METADATA_SESSION.get")
+    def test_get_sa_token_shared_across_tokens(self, mock_metadata_get):
+        fake_response = MagicMock()
+        fake_response.json.return_value = {"access_token": "fake-sa-token", "expires_in": 3599, "token_type": "Bearer"}
+        mock_metadata_get.return_value = fake_response
+
+        # Get the token from two Token instances
+        other_token = Token(token_file=None)
+        first_token = self.gcp_token._get_sa_token()
+        second_token = other_token._get_sa_token()
+
+        # Assertions
+        self.assertEqual(first_token, "fake-sa-token")
+        self.assertEqual(second_token, "fake-sa-token")
+        self.assertEqual(other_token.expiry, self.gcp_token.expiry)
+        mock_metadata_get.assert_called_once()
+
     @patch.dict(os.environ, {"CLOUD_RUN_JOB": 'true'})
     @patch("ops_utils.token_util.Token._get_sa_token")
     def test_get_token_sa_token(self, sa_token_patch):
         sa_token_patch.return_value = "fake-sa-token"
 
-        # Call the method
-        self.gcp_token.get_token()
+        # Call the method, on a Token created while CLOUD_RUN_JOB is set
+        Token(token_file=None).get_token()
 
         # Assert that the SA token method was called if CLOUD_RUN_JOB env is set
         sa_token_patch.assert_called_once()
\ No newline at end of file
@@ -4,9 +4,24 @@ import pytz
 import logging
 import requests
 import os
-from typing import Optional, Union
+import random
+import threading
+from typing import Any, Optional, Union
 from datetime import datetime, timedelta
 
+# Tokens shared by every Token in the process, keyed by identity and scopes, so each is only refreshed once
+_TOKEN_CACHE: dict[tuple, tuple[str, datetime]] = {}
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Timezone new token expiries are logged in
+_EASTERN_TIMEZONE = pytz.timezone("US/Eastern")
+
+# Session reused for every token request to the Cloud Run metadata server, which requires the Metadata-Flavor header
+_METADATA_SESSION = requests.Session()
+_METADATA_SESSION.headers.update({'Metadata-Flavor': 'Google'})
+# Seconds to wait on the metadata server, which is link-local so it should answer quickly
+_METADATA_TIMEOUT = 10
+
 
 class Token:
     """Class for generating tokens for other module services."""
@@ -37,6 +52,14 @@ class Token:
             return
 
         self.token_file = ""
+        # Built the first time a GCP token is refreshed, see _ensure_credentials
+        self.credentials: Any = None
+        self._http: Optional[httplib2.Http] = None
+        self._refresh_lock = threading.Lock()
+        # Refresh about 5 minutes before expiry, jittered so workers sharing an identity do not all refresh at once
+        self._refresh_skew = timedelta(minutes=5, seconds=random.uniform(-60, 60))
+        # Detect once if this is running as a cloud run job, which gets its token from the metadata server
+        self._is_cloud_run_job = bool(os.getenv("CLOUD_RUN_JOB"))
 
         # Default scopes
         scopes = [
@@ -49,40 +72,106 @@ class Token:
         if extra_scopes:
             scopes.extend(extra_scopes)
 
+        self._scopes = scopes
+        self._service_account_json = service_account_json
+        self._cache_key = (service_account_json or "application_default", tuple(sorted(scopes)))
+
+    def _ensure_credentials(self) -> None:
+        """Build the GCP credentials, only the first time they are needed to refresh a token."""
+        if self.credentials is not None:
+            return
         # Use service account if provided
-        if service_account_json:
+        if self._service_account_json:
             from oauth2client.service_account import ServiceAccountCredentials
             self.credentials = ServiceAccountCredentials.from_json_keyfile_name(
-                service_account_json,
-                scopes=scopes
+                self._service_account_json,
+                scopes=self._scopes
             )
         else:
             # Fall back to application default credentials
             from oauth2client.client import GoogleCredentials
             self.credentials = GoogleCredentials.get_application_default()
-            self.credentials = self.credentials.create_scoped(scopes)
+            self.credentials = self.credentials.create_scoped(self._scopes)
+
+    def _is_expiring(self, token_string: Optional[str], expiry: Optional[datetime]) -> bool:
+        """
+        Check if a token has not been set, or is expired or close to expiry.
+
+        Args:
+            token_string (Optional[str]): The token.
+            expiry (Optional[datetime]): When the token expires, in UTC.
+
+        Returns:
+            bool: True if the token needs to be refreshed.
+        """
+        return not token_string or not expiry or expiry < datetime.now(pytz.UTC) + self._refresh_skew
+
+    def _use_shared_token(self, cache_key: tuple) -> bool:
+        """
+        Use the token another Token in the process already fetched for the same identity and scopes.
+
+        Args:
+            cache_key (tuple): The identity and scopes of the token.
+
+        Returns:
+            bool: True if a shared token that is not close to expiry was found.
+        """
+        with _TOKEN_CACHE_LOCK:
+            shared_token = _TOKEN_CACHE.get(cache_key)
+        if shared_token is None or self._is_expiring(*shared_token):
+            return False
+        self.token_string, self.expiry = shared_token
+        return True
+
+    def _share_token(self, cache_key: tuple) -> None:
+        """
+        Share the freshly fetched token with the other Tokens in the process.
+
+        Args:
+            cache_key (tuple): The identity and scopes of the token.
+        """
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[cache_key] = (self.token_string, self.expiry)  # type: ignore[assignment]
+
+    def _refresh_gcp_token(self) -> None:
+        """Refresh the GCP token, reusing the same HTTP client across refreshes."""
+        self._ensure_credentials()
+        if self._http is None:
+            self._http = httplib2.Http()
+        self.credentials.refresh(self._http)
+        self.token_string = self.credentials.get_access_token().access_token
+        # Set expiry to use UTC since google uses that timezone
+        self.expiry = self.credentials.token_expiry.replace(tzinfo=pytz.UTC)  # type: ignore[union-attr]
+        # Convert expiry time to EST for logging
+        est_expiry = self.expiry.astimezone(_EASTERN_TIMEZONE)  # type: ignore[union-attr]
+        logging.info(f"New token expires at {est_expiry} EST")
+        self._share_token(self._cache_key)
 
     def _get_gcp_token(self) -> Union[str, None]:
-        # Refresh token if it has not been set or if it is expired or close to expiry
-        if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
-            http = httplib2.Http()
-            self.credentials.refresh(http)
-            self.token_string = self.credentials.get_access_token().access_token
-            # Set expiry to use UTC since google uses that timezone
-            self.expiry = self.credentials.token_expiry.replace(tzinfo=pytz.UTC)  # type: ignore[union-attr]
-            # Convert expiry time to EST for logging
-            est_expiry = self.expiry.astimezone(pytz.timezone("US/Eastern"))  # type: ignore[union-attr]
-            logging.info(f"New token expires at {est_expiry} EST")
+        # Refresh token if it has not been set or if it is expired or close to expiry, and no other
+        # Token in the process has already refreshed it
+        if self._is_expiring(self.token_string, self.expiry) and not self._use_shared_token(self._cache_key):
+            # Threads sharing this Token refresh it one at a time, since the HTTP client is not thread safe
+            with self._refresh_lock:
+                # Another thread may have refreshed the token while this one waited
+                if self._is_expiring(self.token_string, self.expiry):
+                    self._refresh_gcp_token()
         return self.token_string
 
     def _get_sa_token(self) -> Union[str, None]:
-        if not self.token_string or not self.expiry or self.expiry < datetime.now(pytz.UTC) + timedelta(minutes=5):
-            SCOPES = ['https://www.googleapis.com/auth/userinfo.profile',
-                      'https://www.googleapis.com/auth/userinfo.email']
+        SCOPES = ['https://www.googleapis.com/auth/userinfo.profile',
+                  'https://www.googleapis.com/auth/userinfo.email']
+        cache_key = ("metadata_server", tuple(SCOPES))
+        if self._is_expiring(self.token_string, self.expiry) and not self._use_shared_token(cache_key):
             url = f"http://metadata.google.internal/computeMetadata/v1/instance/service-accounts/default/token?scopes={','.join(SCOPES)}"  # noqa: E501
-            token_response = requests.get(url, headers={'Metadata-Flavor': 'Google'})
-            self.token_string = token_response.json()['access_token']
-        return token_response.json()['access_token']
+            token_response = _METADATA_SESSION.get(url, timeout=_METADATA_TIMEOUT)
+            token_json = token_response.json()
+            self.token_string = token_json['access_token']
+            # The metadata server returns how many seconds the token is valid for, assume an hour if it is missing
+            expires_in = int(token_json.get('expires_in', 3600))
+            self.expiry = datetime.now(pytz.UTC) + timedelta(seconds=expires_in)
+            self._share_token(cache_key)
+        return self.token_string
 
     def get_token(self) -> str:
         """
@@ -95,8 +184,7 @@ class Token:
         if self.token_file:
             return self.token_string  # type: ignore[return-value]
         else:
-            # detect if this is running as a cloud run job
-            if os.getenv("CLOUD_RUN_JOB"):
+            if self._is_cloud_run_job:
                 return self._get_sa_token()  # type: ignore[return-value]
             else:
                 return self._get_gcp_token()  # type: ignore[return-value]
@@ -7,6 +7,7 @@ ARG_DEFAULTS = {
     "max_backoff_time": 5 * 60,
     "update_strategy": "REPLACE",
     "multithread_workers": 10,
+    "connection_pool_size": 32,
     "batch_size": 500,
     "batch_size_to_list_files": 20000,
     "batch_size_to_delete_files": 200,